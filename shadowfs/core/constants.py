@@ -4,6 +4,7 @@ ShadowFS Foundation: Constants and Type Definitions.
 This module provides system-wide constants, error codes, and type definitions
 following Meta-Architecture v1.0.0 principles.
 """
+import stat
 from dataclasses import dataclass
 from enum import Enum, IntEnum
 from typing import NewType, TypeAlias
@@ -44,7 +45,7 @@ TransformName = NewType("TransformName", str)
 
 
 # File attributes matching os.stat_result
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FileAttributes:
     """File attributes matching os.stat_result structure."""
 
@@ -62,22 +63,16 @@ class FileAttributes:
     @property
     def is_dir(self) -> bool:
         """Check if this is a directory."""
-        import stat
-
         return stat.S_ISDIR(self.st_mode)
 
     @property
     def is_file(self) -> bool:
         """Check if this is a regular file."""
-        import stat
-
         return stat.S_ISREG(self.st_mode)
 
     @property
     def is_symlink(self) -> bool:
         """Check if this is a symbolic link."""
-        import stat
-
         return stat.S_ISLNK(self.st_mode)
 
 
@@ -143,8 +138,6 @@ class FileType(Enum):
     @classmethod
     def from_mode(cls, mode: int) -> "FileType":
         """Determine file type from mode."""
-        import stat
-
         if stat.S_ISREG(mode):
             return cls.REGULAR
         elif stat.S_ISDIR(mode):
@@ -6,18 +6,85 @@ resource management, and safety checks.
 
 Following Meta-Architecture v1.0.0 principles.
 """
+import errno
 import hashlib
 import os
 import shutil
 import stat
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from pathlib import Path
-from typing import BinaryIO, Iterator, List, Optional, TextIO, Union
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 from shadowfs.core.constants import ErrorCode, FileAttributes, FileContent, Limits
 from shadowfs.core.path_utils import PathError, is_safe_path, normalize_path, validate_filename
 
+# Anonymous temp files for atomic writes need O_TMPFILE and /proc to link them by fd
+_O_TMPFILE = getattr(os, "O_TMPFILE", 0) if os.path.isdir("/proc/self/fd") else 0
+# Errors meaning the filesystem or kernel cannot create O_TMPFILE inodes
+_TMPFILE_UNSUPPORTED = frozenset({errno.EOPNOTSUPP, errno.EISDIR, errno.EINVAL})
+
+
+class _Hasher(Protocol):
+    """The part of the hashlib object interface used for checksums."""
+
+    def update(self, data: Union[bytes, memoryview], /) -> None:
+        ...
+
+    def hexdigest(self) -> str:
+        ...
+
+
+# Default read size for checksums; larger reads stop paying off past 64 KiB
+CHECKSUM_CHUNK_SIZE = 64 * 1024
+# Common checksum algorithms; anything else goes through hashlib.new
+_HASH_CONSTRUCTORS: Dict[str, Callable[[], _Hasher]] = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "blake2b": hashlib.blake2b,
+    "blake2s": hashlib.blake2s,
+}
+
+# Per-thread reusable checksum read buffers
+_checksum_buffers = threading.local()
+# Readahead hints for whole-file reads
+_POSIX_FADVISE = hasattr(os, "posix_fadvise")
+
+# Kernel-side file copies for copy_file (Linux 4.5+)
+_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+# Errors meaning copy_file_range cannot copy between these files at all
+_COPY_RANGE_UNSUPPORTED = frozenset(
+    {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ETXTBSY, errno.EPERM}
+)
+# In-kernel copies for kernels or filesystems without copy_file_range
+_SENDFILE = hasattr(os, "sendfile")
+# Errors meaning sendfile cannot copy between these files at all
+_SENDFILE_UNSUPPORTED = frozenset({errno.ENOSYS, errno.EINVAL, errno.ENOTSOCK, errno.EOPNOTSUPP})
+# Buffer size for the user-space copy when neither syscall applies
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Mode changes through O_PATH descriptors, which need no read permission
+_O_PATH = getattr(os, "O_PATH", 0) if os.path.isdir("/proc/self/fd") else 0
+
+# Errors from rename that shutil.move handles by moving into a directory or copying
+_RENAME_FALLBACK = frozenset({errno.EXDEV, errno.EISDIR, errno.EEXIST, errno.ENOTEMPTY})
+# Errors meaning move_file cannot hard-link source (directory, other device, no link support)
+_LINK_UNSUPPORTED = frozenset({errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.EMLINK})
+
 
 class FileOperationError(Exception):
     """Base exception for file operation errors."""
@@ -55,16 +122,19 @@ def read_file(
     try:
         path = normalize_path(path)
 
-        # Check file size before reading
-        file_size = os.path.getsize(path)
-        if file_size > size_limit:
-            raise FileOperationError(
-                f"File size ({file_size}) exceeds limit ({size_limit})", ErrorCode.INVALID_INPUT
-            )
-
         mode = "rb" if binary else "r"
         with open(path, mode) as f:
-            content = f.read(size_limit)
+            # Check the size of the file actually opened before reading
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size > size_limit:
+                raise FileOperationError(
+                    f"File size ({file_size}) exceeds limit ({size_limit})",
+                    ErrorCode.INVALID_INPUT,
+                )
+
+            # read(size_limit) allocates size_limit bytes (2 GiB by default) up
+            # front, so size binary reads from fstat. Pseudo-files report 0.
+            content = f.read(file_size if binary and file_size else size_limit)
 
         return content
 
@@ -107,14 +177,7 @@ def write_file(
         mode = "wb" if binary else "w"
 
         if atomic:
-            # Atomic write using temporary file
-            dir_name = os.path.dirname(path)
-            with tempfile.NamedTemporaryFile(mode=mode, dir=dir_name, delete=False) as tmp_file:
-                tmp_file.write(content)
-                tmp_path = tmp_file.name
-
-            # Atomic rename
-            os.replace(tmp_path, path)
+            _write_atomic(path, content, mode)
         else:
             # Direct write
             with open(path, mode) as f:
@@ -126,6 +189,91 @@ def write_file(
         raise FileOperationError(f"Failed to write file: {e}", ErrorCode.INTERNAL_ERROR)
 
 
+def _write_atomic(path: str, content: Union[bytes, str], mode: str) -> None:
+    """Write content so that path only ever holds the old or the new data.
+
+    Args:
+        path: Normalized path to file
+        content: Content to write
+        mode: Open mode ('wb' or 'w')
+    """
+    dir_name = os.path.dirname(path)
+    if _O_TMPFILE and _write_tmpfile(path, dir_name, content, mode):
+        return
+
+    # Fallback: named temporary file renamed into place
+    tmp_file = tempfile.NamedTemporaryFile(mode=mode, dir=dir_name, delete=False)
+    try:
+        with tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_file.name, path)
+    except BaseException:
+        _remove_quietly(tmp_file.name)
+        raise
+
+
+def _write_tmpfile(path: str, dir_name: str, content: Union[bytes, str], mode: str) -> bool:
+    """Write content to an unnamed O_TMPFILE inode, then link it at path.
+
+    The inode has no directory entry until it is complete, so a failed write
+    leaves nothing behind. New files are linked directly; an existing file is
+    replaced by linking under a temporary name and renaming over it.
+
+    Args:
+        path: Normalized path to file
+        dir_name: Directory containing path
+        content: Content to write
+        mode: Open mode ('wb' or 'w')
+
+    Returns:
+        False if the filesystem does not support O_TMPFILE, True once written
+    """
+    try:
+        # Owner-only, like the mkstemp file of the fallback path, so the
+        # result does not depend on which path the filesystem supports
+        fd = os.open(dir_name, _O_TMPFILE | os.O_WRONLY, 0o600)
+    except OSError as e:
+        if e.errno in _TMPFILE_UNSUPPORTED:
+            return False
+        raise
+
+    with open(fd, mode) as f:
+        f.write(content)
+        f.flush()
+
+        # os.link only uses linkat(AT_SYMLINK_FOLLOW), which resolves the
+        # /proc/self/fd entry to the inode, when given a directory fd
+        dir_fd = os.open(dir_name, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            fd_path = f"/proc/self/fd/{fd}"
+            name = os.path.basename(path)
+            try:
+                os.link(fd_path, name, dst_dir_fd=dir_fd)
+            except FileExistsError:
+                tmp_name = f".{name}.{os.urandom(4).hex()}.tmp"
+                os.link(fd_path, tmp_name, dst_dir_fd=dir_fd)
+                try:
+                    os.replace(tmp_name, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+                except BaseException:
+                    _remove_quietly(os.path.join(dir_name, tmp_name))
+                    raise
+        finally:
+            os.close(dir_fd)
+    return True
+
+
+def _remove_quietly(path: str) -> None:
+    """Remove a leftover temporary file, ignoring errors.
+
+    Args:
+        path: Path to remove
+    """
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
 def delete_file(path: str, safe: bool = True) -> None:
     """Safely delete a file.
 
@@ -193,16 +341,21 @@ def copy_file(
         if not os.path.exists(source):
             raise FileOperationError(f"Source file not found: {source}", ErrorCode.NOT_FOUND)
 
-        # Check destination
-        if os.path.exists(destination) and not overwrite:
+        # Like shutil.copy, copy into an existing directory when overwriting
+        if overwrite and os.path.isdir(destination):
+            destination = os.path.join(destination, os.path.basename(source))
+
+        try:
+            _copy_data(source, destination, exclusive=not overwrite)
+        except FileExistsError:
             raise FileOperationError(
                 f"Destination already exists: {destination}", ErrorCode.CONFLICT
             )
 
         if preserve_metadata:
-            shutil.copy2(source, destination)
+            shutil.copystat(source, destination)
         else:
-            shutil.copy(source, destination)
+            shutil.copymode(source, destination)
 
     except PermissionError:
         raise FileOperationError(f"Permission denied", ErrorCode.PERMISSION_DENIED)
@@ -210,6 +363,125 @@ def copy_file(
         raise FileOperationError(f"Failed to copy file: {e}", ErrorCode.INTERNAL_ERROR)
 
 
+def _copy_data(source: str, destination: str, exclusive: bool) -> None:
+    """Copy file contents, letting the kernel copy them where it can.
+
+    Args:
+        source: Normalized source file path
+        destination: Normalized destination file path
+        exclusive: Create destination with O_EXCL, failing if it exists
+
+    Raises:
+        FileExistsError: If exclusive and destination already exists
+        shutil.SameFileError: If source and destination are the same file
+    """
+    with open(source, "rb") as fsrc:
+        src_fd = fsrc.fileno()
+        src_stat = os.fstat(src_fd)
+
+        # O_EXCL detects an existing destination in the same syscall that
+        # creates it; without it, skip O_TRUNC so copying a file onto itself
+        # is detected before its contents are destroyed
+        flags = os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC
+        dst_fd = os.open(destination, flags | os.O_EXCL if exclusive else flags, 0o666)
+        try:
+            with open(dst_fd, "wb") as fdst:
+                if not exclusive:
+                    if os.path.samestat(src_stat, os.fstat(dst_fd)):
+                        raise shutil.SameFileError(
+                            f"{source!r} and {destination!r} are the same file"
+                        )
+                    os.ftruncate(dst_fd, 0)
+
+                if not (
+                    stat.S_ISREG(src_stat.st_mode)
+                    and _copy_in_kernel(src_fd, dst_fd, src_stat.st_size)
+                ):
+                    shutil.copyfileobj(fsrc, fdst, COPY_BUFFER_SIZE)
+        except BaseException:
+            # Do not leave a partial file where none existed before
+            if exclusive:
+                _remove_quietly(destination)
+            raise
+
+
+def _copy_in_kernel(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Copy a regular file without reading it into user space.
+
+    Tries copy_file_range(2), then sendfile(2) for kernels and filesystems
+    that lack it.
+
+    Args:
+        src_fd: Source file descriptor, positioned at the start
+        dst_fd: Empty destination file descriptor
+        size: Source file size
+
+    Returns:
+        False if neither syscall can copy this file and nothing was
+        written, True once the whole file is copied
+    """
+    if _COPY_FILE_RANGE and _copy_file_range(src_fd, dst_fd, size):
+        return True
+    return _SENDFILE and _sendfile(src_fd, dst_fd, size)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Copy a regular file with copy_file_range(2).
+
+    The data never passes through user space, and filesystems that support
+    it share extents (reflink) or copy server-side (NFS, SMB) instead.
+
+    Args:
+        src_fd: Source file descriptor, positioned at the start
+        dst_fd: Empty destination file descriptor
+        size: Source file size
+
+    Returns:
+        False if copy_file_range cannot copy this file and nothing was
+        written, True once the whole file is copied
+    """
+    copied = 0
+    block_size = max(size, 1 << 23)
+    while True:
+        try:
+            count = os.copy_file_range(src_fd, dst_fd, block_size)
+        except OSError as e:
+            if copied == 0 and e.errno in _COPY_RANGE_UNSUPPORTED:
+                return False
+            raise
+        if not count:
+            # Nothing copied at all may be a pseudo-file reporting size 0;
+            # let the caller read it normally
+            return copied > 0
+        copied += count
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Copy a regular file with sendfile(2).
+
+    Args:
+        src_fd: Source file descriptor, positioned at the start
+        dst_fd: Empty destination file descriptor
+        size: Source file size
+
+    Returns:
+        False if sendfile cannot copy this file and nothing was written,
+        True once the whole file is copied
+    """
+    copied = 0
+    block_size = max(size, 1 << 23)
+    while True:
+        try:
+            count = os.sendfile(dst_fd, src_fd, None, block_size)
+        except OSError as e:
+            if copied == 0 and e.errno in _SENDFILE_UNSUPPORTED:
+                return False
+            raise
+        if not count:
+            return copied > 0
+        copied += count
+
+
 def move_file(source: str, destination: str, overwrite: bool = False) -> None:
     """Safely move a file.
 
@@ -229,13 +501,10 @@ def move_file(source: str, destination: str, overwrite: bool = False) -> None:
         if not os.path.exists(source):
             raise FileOperationError(f"Source file not found: {source}", ErrorCode.NOT_FOUND)
 
-        # Check destination
-        if os.path.exists(destination) and not overwrite:
-            raise FileOperationError(
-                f"Destination already exists: {destination}", ErrorCode.CONFLICT
-            )
-
-        shutil.move(source, destination)
+        if overwrite:
+            _rename(source, destination)
+        else:
+            _rename_no_replace(source, destination)
 
     except PermissionError:
         raise FileOperationError(f"Permission denied", ErrorCode.PERMISSION_DENIED)
@@ -243,6 +512,65 @@ def move_file(source: str, destination: str, overwrite: bool = False) -> None:
         raise FileOperationError(f"Failed to move file: {e}", ErrorCode.INTERNAL_ERROR)
 
 
+def _rename(source: str, destination: str) -> None:
+    """Move source to destination, replacing it if it exists.
+
+    As with shutil.move, an existing destination directory means "move into
+    it". os.rename would instead replace an empty destination directory with
+    a source directory, so the fast path is only taken for other destinations.
+
+    Args:
+        source: Normalized source path
+        destination: Normalized destination path
+    """
+    if os.path.isdir(destination):
+        shutil.move(source, destination)
+        return
+
+    try:
+        os.rename(source, destination)
+    except OSError as e:
+        if e.errno not in _RENAME_FALLBACK:
+            raise
+        # Cross-device move, or destination turned into a directory meanwhile
+        shutil.move(source, destination)
+
+
+def _rename_no_replace(source: str, destination: str) -> None:
+    """Move source to destination, failing if destination exists.
+
+    Hard-linking the new name fails with EEXIST if destination appears at
+    any point, so there is no window between checking and moving.
+
+    Args:
+        source: Normalized source path
+        destination: Normalized destination path
+
+    Raises:
+        FileOperationError: If destination already exists
+    """
+    try:
+        os.link(source, destination)
+    except FileExistsError:
+        raise FileOperationError(f"Destination already exists: {destination}", ErrorCode.CONFLICT)
+    except OSError as e:
+        if e.errno not in _LINK_UNSUPPORTED:
+            raise
+        # Directories, cross-device moves and filesystems without hard links
+        if os.path.exists(destination):
+            raise FileOperationError(
+                f"Destination already exists: {destination}", ErrorCode.CONFLICT
+            )
+        shutil.move(source, destination)
+        return
+
+    try:
+        os.unlink(source)
+    except BaseException:
+        _remove_quietly(destination)
+        raise
+
+
 def get_file_attributes(path: str, follow_symlinks: bool = True) -> FileAttributes:
     """Get file attributes (stat information).
 
@@ -407,12 +735,16 @@ def list_directory(path: str, include_hidden: bool = False) -> List[str]:
     try:
         path = normalize_path(path)
 
+        # Names only: os.listdir needs no per-entry stat, and is cheaper than
+        # os.scandir because it does not build DirEntry objects
         entries = os.listdir(path)
 
         if not include_hidden:
-            entries = [e for e in entries if not e.startswith(".")]
+            # listdir never returns empty names
+            entries = [e for e in entries if e[0] != "."]
 
-        return sorted(entries)
+        entries.sort()
+        return entries
 
     except FileNotFoundError:
         raise FileOperationError(f"Directory not found: {path}", ErrorCode.NOT_FOUND)
@@ -469,7 +801,33 @@ def open_file(
                 pass  # Best effort close
 
 
-def calculate_checksum(path: str, algorithm: str = "sha256", chunk_size: int = 8192) -> str:
+def _new_hasher(algorithm: str) -> _Hasher:
+    """Create a hash object for an algorithm name.
+
+    Args:
+        algorithm: Hash algorithm name
+
+    Returns:
+        New hash object
+
+    Raises:
+        FileOperationError: If the algorithm is not supported
+    """
+    # Direct constructors skip hashlib.new's by-name lookup
+    constructor = _HASH_CONSTRUCTORS.get(algorithm)
+    if constructor is not None:
+        return constructor()
+    try:
+        return hashlib.new(algorithm)
+    except ValueError:
+        raise FileOperationError(
+            f"Unsupported hash algorithm: {algorithm}", ErrorCode.INVALID_INPUT
+        )
+
+
+def calculate_checksum(
+    path: str, algorithm: str = "sha256", chunk_size: int = CHECKSUM_CHUNK_SIZE
+) -> str:
     """Calculate file checksum.
 
     Args:
@@ -486,18 +844,15 @@ def calculate_checksum(path: str, algorithm: str = "sha256", chunk_size: int = 8
     try:
         path = normalize_path(path)
 
-        # Get hash algorithm
-        try:
-            hasher = hashlib.new(algorithm)
-        except ValueError:
-            raise FileOperationError(
-                f"Unsupported hash algorithm: {algorithm}", ErrorCode.INVALID_INPUT
-            )
+        hasher = _new_hasher(algorithm)
 
-        # Calculate checksum
-        with open(path, "rb") as f:
-            while chunk := f.read(chunk_size):
-                hasher.update(chunk)
+        # Read straight into one reusable buffer; hashlib hands each chunk to
+        # OpenSSL (which selects SHA-NI/ARMv8 SHA itself) with the GIL released
+        buffer, view = _checksum_buffer(chunk_size)
+        with open(path, "rb", buffering=0) as f:
+            _advise_sequential(f.fileno())
+            while size := f.readinto(buffer):
+                hasher.update(view[:size])
 
         return hasher.hexdigest()
 
@@ -509,6 +864,85 @@ def calculate_checksum(path: str, algorithm: str = "sha256", chunk_size: int = 8
         raise FileOperationError(f"Failed to calculate checksum: {e}", ErrorCode.INTERNAL_ERROR)
 
 
+def _checksum_buffer(chunk_size: int) -> Tuple[bytearray, memoryview]:
+    """Get a read buffer for checksumming.
+
+    Default-sized buffers are kept per thread, so hashing many small files
+    does not allocate and zero a fresh buffer for each one.
+
+    Args:
+        chunk_size: Buffer size in bytes
+
+    Returns:
+        Buffer and a memoryview over it
+    """
+    if chunk_size != CHECKSUM_CHUNK_SIZE:
+        buffer = bytearray(chunk_size)
+        return buffer, memoryview(buffer)
+
+    cached = getattr(_checksum_buffers, "cached", None)
+    if cached is None:
+        buffer = bytearray(chunk_size)
+        cached = _checksum_buffers.cached = (buffer, memoryview(buffer))
+    return cached
+
+
+def _advise_sequential(fd: int) -> None:
+    """Tell the kernel a file will be read once from start to end.
+
+    Linux doubles the readahead window for the file, so cold reads overlap
+    disk I/O with hashing. The hint is advisory; failures (e.g. ESPIPE on a
+    FIFO) are ignored.
+
+    Args:
+        fd: Open file descriptor
+    """
+    if _POSIX_FADVISE:
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def calculate_checksums(
+    paths: List[str],
+    algorithm: str = "sha256",
+    chunk_size: int = CHECKSUM_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """Calculate checksums for many files concurrently.
+
+    Files are hashed on a thread pool; both the reads and hashlib's digest
+    updates release the GIL, so small-file batches overlap their I/O and
+    hashing instead of running one file at a time.
+
+    Args:
+        paths: File paths
+        algorithm: Hash algorithm ('md5', 'sha1', 'sha256', etc)
+        chunk_size: Bytes to read at a time
+        max_workers: Thread pool size (None for one per CPU)
+
+    Returns:
+        Mapping of each given path to the hex digest of its checksum
+
+    Raises:
+        FileOperationError: If any checksum calculation fails
+    """
+    # Fail once for a bad algorithm rather than once per file
+    _new_hasher(algorithm)
+
+    def checksum(path: str) -> str:
+        return calculate_checksum(path, algorithm, chunk_size)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1 or len(paths) <= 1:
+        return {path: checksum(path) for path in paths}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+        return dict(zip(paths, executor.map(checksum, paths)))
+
+
 def set_permissions(path: str, mode: int) -> None:
     """Set file permissions.
 
@@ -531,6 +965,153 @@ def set_permissions(path: str, mode: int) -> None:
         raise FileOperationError(f"Failed to set permissions: {e}", ErrorCode.INTERNAL_ERROR)
 
 
+def set_permissions_recursive(path: str, mode: int, dir_mode: Optional[int] = None) -> None:
+    """Set permissions on every file and directory in a tree.
+
+    Entries are opened relative to their parent directory's descriptor
+    without following symlinks, so paths are never re-walked and an entry
+    swapped for a symlink mid-walk is skipped rather than changing the
+    link's target. Symlinks are neither followed nor changed. The walk keeps
+    an explicit stack, so tree depth is only bounded by open descriptors.
+
+    Args:
+        path: Root directory (or single file) path
+        mode: Permission mode for files (e.g., 0o644)
+        dir_mode: Permission mode for directories, including path itself
+            (default: mode)
+
+    Raises:
+        FileOperationError: If any permission change fails
+    """
+    if dir_mode is None:
+        dir_mode = mode
+
+    try:
+        path = normalize_path(path)
+
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        except NotADirectoryError:
+            os.chmod(path, mode)
+            return
+
+        try:
+            _chmod_tree(fd, mode, dir_mode)
+        finally:
+            os.close(fd)
+
+    except FileNotFoundError:
+        raise FileOperationError(f"File not found: {path}", ErrorCode.NOT_FOUND)
+    except PermissionError:
+        raise FileOperationError(f"Permission denied: {path}", ErrorCode.PERMISSION_DENIED)
+    except (OSError, IOError) as e:
+        raise FileOperationError(f"Failed to set permissions: {e}", ErrorCode.INTERNAL_ERROR)
+
+
+def _chmod_tree(root_fd: int, mode: int, dir_mode: int) -> None:
+    """Set permissions below an open directory, then on the directory itself.
+
+    Each directory is changed after its contents, so a dir_mode without
+    search permission does not stop the walk.
+
+    Args:
+        root_fd: Open directory descriptor, owned by the caller
+        mode: Permission mode for files
+        dir_mode: Permission mode for directories
+    """
+    # (directory fd, subdirectory names still to visit); only root_fd is not ours
+    stack = [(root_fd, _chmod_entries(root_fd, mode))]
+    try:
+        while stack:
+            dir_fd, subdirs = stack[-1]
+            if not subdirs:
+                os.fchmod(dir_fd, dir_mode)
+                stack.pop()
+                if dir_fd != root_fd:
+                    os.close(dir_fd)
+                continue
+
+            name = subdirs.pop()
+            try:
+                fd = os.open(
+                    name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW | os.O_CLOEXEC, dir_fd=dir_fd
+                )
+            except OSError as e:
+                # A symlink fails O_NOFOLLOW | O_DIRECTORY with ENOTDIR (or ELOOP);
+                # skip entries replaced by one since listing
+                if e.errno in (errno.ENOTDIR, errno.ELOOP) and stat.S_ISLNK(
+                    os.stat(name, dir_fd=dir_fd, follow_symlinks=False).st_mode
+                ):
+                    continue
+                raise
+            # Push before listing so the descriptor is closed if listing fails
+            stack.append((fd, []))
+            stack[-1] = (fd, _chmod_entries(fd, mode))
+    finally:
+        for dir_fd, _ in stack:
+            if dir_fd != root_fd:
+                os.close(dir_fd)
+
+
+def _chmod_entries(dir_fd: int, mode: int) -> List[str]:
+    """Set permissions on the non-directory entries of an open directory.
+
+    Args:
+        dir_fd: Open directory descriptor
+        mode: Permission mode for files
+
+    Returns:
+        Names of the subdirectories, which are left unchanged
+    """
+    subdirs = []
+    with os.scandir(dir_fd) as entries:
+        for entry in entries:
+            # d_type from getdents answers these without a stat
+            if entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+            else:
+                _chmod_nofollow(entry.name, mode, dir_fd)
+    return subdirs
+
+
+def _chmod_nofollow(name: str, mode: int, dir_fd: int) -> None:
+    """Set the permissions of a directory entry unless it is a symlink.
+
+    The d_type seen while listing may be stale, so the entry is opened
+    without following symlinks and changed through that descriptor.
+
+    Args:
+        name: Entry name
+        mode: Permission mode
+        dir_fd: Descriptor of the directory containing name
+    """
+    flags = os.O_NOFOLLOW | os.O_CLOEXEC
+    if _O_PATH:
+        # O_PATH needs no read permission and opens a symlink itself
+        fd = os.open(name, flags | _O_PATH, dir_fd=dir_fd)
+        try:
+            if not stat.S_ISLNK(os.fstat(fd).st_mode):
+                # fchmod rejects O_PATH descriptors; the /proc entry reaches the inode
+                os.chmod(f"/proc/self/fd/{fd}", mode)
+        finally:
+            os.close(fd)
+        return
+
+    try:
+        # Non-blocking so FIFOs and devices open without waiting
+        fd = os.open(name, flags | os.O_RDONLY | os.O_NONBLOCK | os.O_NOCTTY, dir_fd=dir_fd)
+    except OSError as e:
+        if e.errno == errno.ELOOP:
+            return
+        raise
+    try:
+        os.fchmod(fd, mode)
+    finally:
+        os.close(fd)
+
+
 def create_symlink(target: str, link_path: str) -> None:
     """Create a symbolic link.
 
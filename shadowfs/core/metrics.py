@@ -17,15 +17,40 @@ Example:
     >>> print(metrics.export_prometheus())
 """
 
+import itertools
+import random
 import threading
 import time
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from shadowfs.core.constants import ErrorCode
 
+# Number of lock stripes per metric guarding label-set updates (must be a power of two)
+LOCK_STRIPES = 16
+
+# Default number of observations sampled per summary label set
+DEFAULT_RESERVOIR_SIZE = 1024
+
+# Histogram batches at least this large are binned by sorting instead of per value
+SORTED_BINNING_MIN_BATCH = 32
+
+# Quantiles exported for summaries
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+# Clock for metric value timestamps (integer nanoseconds), bound once for the hot paths
+_timestamp = time.monotonic_ns
+
+# Source of metric versions; next() on a count is atomic under the GIL
+_versions = itertools.count(1)
+
 
 class MetricType(Enum):
     """Types of metrics supported."""
@@ -36,30 +61,540 @@ class MetricType(Enum):
     SUMMARY = "summary"  # Statistical summary of values
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _canonical_labels(items: FrozenSet[Tuple[str, str]]) -> str:
+    """Serialize a frozen label set, caching the result.
+
+    Args:
+        items: Frozen set of (name, value) label pairs
+
+    Returns:
+        Serialized label string
+    """
+    return ",".join(f"{k}={v}" for k, v in sorted(items))
+
+
+def _label_key(labels: Dict[str, str]) -> str:
+    """Serialize labels to a consistent string key.
+
+    Label sets repeat on nearly every update, so the sort and join are
+    cached per distinct set. A single label needs no sorting and is
+    formatted directly, which is cheaper than building the cache key.
+
+    Args:
+        labels: Label dictionary
+
+    Returns:
+        Serialized label string
+    """
+    if not labels:
+        return ""
+    if len(labels) == 1:
+        ((k, v),) = labels.items()
+        return f"{k}={v}"
+    return _canonical_labels(frozenset(labels.items()))
+
+
+@lru_cache(maxsize=8192)
+def _prometheus_labels(items: FrozenSet[Tuple[str, str]]) -> str:
+    """Format a frozen label set for Prometheus export, caching the result.
+
+    Args:
+        items: Frozen set of (name, value) label pairs
+
+    Returns:
+        Formatted label string
+    """
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(items)) + "}"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Format labels for Prometheus export.
+
+    Args:
+        labels: Label dictionary
+
+    Returns:
+        Formatted label string
+    """
+    if not labels:
+        return ""
+    return _prometheus_labels(frozenset(labels.items()))
+
+
+@lru_cache(maxsize=8192)
+def _prometheus_label_template(items: FrozenSet[Tuple[str, str]], extra: str) -> Tuple[str, str]:
+    """Split a frozen label set around an extra label, caching the result.
+
+    Args:
+        items: Frozen set of (name, value) label pairs
+        extra: Name of the label inserted per line
+
+    Returns:
+        (head, tail) such that ``head + f'{extra}="v"' + tail`` is the
+        formatted label string
+    """
+    before = []
+    after = []
+    for k, v in sorted(items):
+        if k < extra:
+            before.append(f'{k}="{v}",')
+        elif k > extra:
+            after.append(f',{k}="{v}"')
+    return "{" + "".join(before), "".join(after) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value for Prometheus export.
+
+    Integral floats are written without the trailing ``.0``; other values
+    keep their shortest round-trip representation.
+
+    Args:
+        value: Sample value
+
+    Returns:
+        Formatted value
+    """
+    if isinstance(value, float) and value.is_integer() and abs(value) < 2**53:
+        return str(int(value))
+    return str(value)
+
+
+def _bin_values(
+    bucket_counts: List[int], buckets: Sequence[float], values: Sequence[float]
+) -> None:
+    """Add observations to non-cumulative histogram bucket counts.
+
+    Args:
+        bucket_counts: Count per bucket, with a final +Inf slot; updated in place
+        buckets: Sorted bucket upper limits
+        values: Observed values
+    """
+    if len(values) < SORTED_BINNING_MIN_BATCH:
+        for value in values:
+            # Values equal to a bucket limit belong in that bucket (le semantics)
+            bucket_counts[bisect_left(buckets, value)] += 1
+        return
+
+    # Sort the batch once and cut it at each bucket limit
+    ordered = sorted(values)
+    start = 0
+    for i, limit in enumerate(buckets):
+        end = bisect_right(ordered, limit, start)
+        bucket_counts[i] += end - start
+        start = end
+    bucket_counts[-1] += len(ordered) - start
+
+
+def _quantiles(
+    sorted_values: Sequence[float], quantiles: Sequence[float]
+) -> List[Tuple[float, float]]:
+    """Pick quantiles from sorted values.
+
+    Quantile q is the value at index ``int(len * q)``; quantiles whose index
+    falls past the end are omitted.
+
+    Args:
+        sorted_values: Values in ascending order
+        quantiles: Quantiles to pick, each in [0, 1]
+
+    Returns:
+        List of (quantile, value) pairs
+    """
+    n = len(sorted_values)
+    points = []
+    for q in quantiles:
+        idx = int(n * q)
+        if idx < n:
+            points.append((q, sorted_values[idx]))
+    return points
+
+
+@dataclass(slots=True)
 class MetricValue:
-    """Single metric value with labels."""
+    """Single metric value with labels.
+
+    The serialized label key is computed once at construction so the value
+    can be filed and looked up without re-serializing its labels.
+    """
 
     value: float
     labels: Dict[str, str] = field(default_factory=dict)
-    timestamp: float = field(default_factory=time.time)
+    timestamp: int = field(default_factory=_timestamp)  # Nanoseconds, monotonic clock
+    # Empty labels serialize to "", so an empty key only needs computing when labels are set
+    labels_key: str = field(default="", repr=False, compare=False)
+    # Prometheus-formatted labels, filled in on first export
+    label_string: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compute the serialized label key if not supplied."""
+        if not self.labels_key and self.labels:
+            self.labels_key = _label_key(self.labels)
 
+    def format_labels(self) -> str:
+        """Get the Prometheus-formatted labels, formatting them on first use.
 
-@dataclass
+        Returns:
+            Formatted label string
+        """
+        if self.label_string is None:
+            self.label_string = _format_labels(self.labels)
+        return self.label_string
+
+
+class _ShardOwner:
+    """Per-thread token owning a counter shard.
+
+    Only the thread's ``threading.local`` references it, so it is freed, and
+    weak references to it die, as soon as the OS thread exits. That holds
+    for threads started outside Python too, whose ``_DummyThread`` objects
+    stay alive forever.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+@dataclass(slots=True)
+class HistogramSeries:
+    """Running histogram aggregates for one label set."""
+
+    labels: Dict[str, str]
+    bucket_counts: List[int]  # Per bucket, non-cumulative; last entry is +Inf
+    count: int = 0
+    sum: float = 0.0
+
+
+@dataclass(slots=True)
+class SummarySeries:
+    """Running summary aggregates for one label set.
+
+    Quantiles are estimated from a fixed-size uniform random sample of the
+    observations (reservoir sampling), while count and sum stay exact.
+    """
+
+    labels: Dict[str, str]
+    # Packed float64 samples (array is not subscriptable at runtime before 3.12)
+    reservoir: "array[float]" = field(default_factory=lambda: array("d"))
+    count: int = 0
+    sum: float = 0.0
+    # Sorted copy of the reservoir, reused by exports until the next observation
+    sorted_reservoir: Optional[List[float]] = field(default=None, repr=False, compare=False)
+
+
+@dataclass(slots=True)
 class Metric:
-    """Metric definition and values."""
+    """Metric definition and values.
+
+    Counter and gauge values are stored once per label set, keyed by the
+    serialized labels, so updates are a dict lookup rather than a scan.
+    Counter increments go to a per-thread shard without locking and are
+    merged across threads when the values are read. Other updates lock
+    only the stripe for their label set, so different label sets of the
+    same metric do not contend.
+    Histogram observations are binned into per-label-set bucket counts as
+    they are recorded, and summaries keep a bounded reservoir sample for
+    quantiles, so export cost and memory do not grow with sample count.
+    Raw observations are only kept when ``retain_raw_samples`` is set.
+    """
 
     name: str
     metric_type: MetricType
     description: str
-    values: List[MetricValue] = field(default_factory=list)
-    buckets: Optional[List[float]] = None  # For histograms
-
-    def __post_init__(self):
+    buckets: Optional[Sequence[float]] = None  # For histograms; sorted list once initialized
+    retain_raw_samples: bool = False  # Keep every histogram/summary observation
+    reservoir_size: int = DEFAULT_RESERVOIR_SIZE  # For summaries
+    _by_labels: Dict[str, MetricValue] = field(default_factory=dict, init=False, repr=False)
+    _samples: List[MetricValue] = field(default_factory=list, init=False, repr=False)
+    _histogram: Dict[str, HistogramSeries] = field(default_factory=dict, init=False, repr=False)
+    _summary: Dict[str, SummarySeries] = field(default_factory=dict, init=False, repr=False)
+    # Per-thread counter shards with a weak reference to their owning (and
+    # only writing) thread's token
+    _shards: List[Tuple["weakref.ReferenceType[_ShardOwner]", Dict[str, MetricValue]]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _local: threading.local = field(
+        default_factory=threading.local, init=False, repr=False, compare=False
+    )
+    # Prometheus name and HELP/TYPE header, prebuilt by the collector on registration
+    _full_name: str = field(default="", init=False, repr=False, compare=False)
+    _prelude: str = field(default="", init=False, repr=False, compare=False)
+    # Bumped on every update; export reuses _rendered while they match
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _rendered: Optional[Tuple[int, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Guards shard registration, export and clear
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+    # Guard series updates and label-set creation, striped by label key
+    _stripes: Tuple[threading.Lock, ...] = field(
+        default_factory=lambda: tuple(threading.Lock() for _ in range(LOCK_STRIPES)),
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def __post_init__(self) -> None:
         """Initialize histogram buckets if needed."""
-        if self.metric_type == MetricType.HISTOGRAM and self.buckets is None:
-            # Default buckets: 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
-            self.buckets = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+        if self.metric_type == MetricType.HISTOGRAM:
+            if self.buckets is None:
+                # Default buckets: 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+                self.buckets = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+            else:
+                self.buckets = sorted(self.buckets)
+
+    @property
+    def values(self) -> List[MetricValue]:
+        """Get metric values.
+
+        Returns:
+            One value per label set for counters and gauges, every
+            observation for histograms and summaries retaining raw samples
+        """
+        if self.metric_type in (MetricType.HISTOGRAM, MetricType.SUMMARY):
+            return self._samples
+        if self.metric_type == MetricType.COUNTER:
+            return self._merge_shards()
+        return list(self._by_labels.values())
+
+    @values.setter
+    def values(self, values: List[MetricValue]) -> None:
+        """Replace metric values.
+
+        Args:
+            values: New metric values
+        """
+        self.clear()
+        if self.metric_type in (MetricType.HISTOGRAM, MetricType.SUMMARY):
+            for metric_value in values:
+                if self.retain_raw_samples:
+                    self._samples.append(metric_value)
+                self._update_series(
+                    metric_value.labels_key, metric_value.labels, (metric_value.value,)
+                )
+        else:
+            for metric_value in values:
+                self._by_labels[metric_value.labels_key] = metric_value
+        self.touch()
+
+    def touch(self) -> None:
+        """Mark the metric as updated, invalidating its rendered export."""
+        self._version = next(_versions)
+
+    def stripe_lock(self, label_key: str) -> threading.Lock:
+        """Get the lock stripe guarding a label set's values.
+
+        Args:
+            label_key: Serialized labels
+
+        Returns:
+            Lock shared by all label sets hashing to the same stripe
+        """
+        return self._stripes[hash(label_key) & (LOCK_STRIPES - 1)]
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the metric lock and every stripe, excluding all updates."""
+        with self._lock:
+            for lock in self._stripes:
+                lock.acquire()
+            try:
+                yield
+            finally:
+                for lock in self._stripes:
+                    lock.release()
+
+    def thread_shard(self) -> Dict[str, MetricValue]:
+        """Get the calling thread's counter shard, creating it on first use.
+
+        Returns:
+            Label key to value map written only by the calling thread
+        """
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            owner = _ShardOwner()
+            self._local.owner = owner
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append((weakref.ref(owner), shard))
+        return shard
+
+    def fold_dead_shards(self) -> None:
+        """Merge the shards of exited threads into the base values.
+
+        A thread counts as exited once its shard owner token has been freed,
+        which also covers threads started outside Python. Keeps the shard
+        list, and so the cost of reading counters, bounded by the number of
+        live threads. Must be called with the metric lock held.
+        """
+        live = []
+        for owner, shard in self._shards:
+            if owner() is not None:
+                live.append((owner, shard))
+                continue
+
+            # The owner has exited, so nothing writes to its cells any more
+            for cell in shard.values():
+                total = self._by_labels.get(cell.labels_key)
+                if total is None:
+                    self._by_labels[cell.labels_key] = cell
+                else:
+                    total.value += cell.value
+                    total.timestamp = max(total.timestamp, cell.timestamp)
+        self._shards = live
+
+    def _merge_shards(self) -> List[MetricValue]:
+        """Sum counter values across all thread shards.
+
+        Returns:
+            One value per label set, stamped with its latest update
+        """
+        sums: Dict[str, float] = defaultdict(float)
+        latest: Dict[str, MetricValue] = {}
+        for shard in [self._by_labels, *(shard for _, shard in self._shards)]:
+            for cell in list(shard.values()):
+                label_key = cell.labels_key
+                sums[label_key] += cell.value
+                seen = latest.get(label_key)
+                if seen is None or cell.timestamp > seen.timestamp:
+                    latest[label_key] = cell
+
+        merged = []
+        for label_key, cell in latest.items():
+            total = MetricValue(
+                value=sums[label_key],
+                labels=cell.labels,
+                timestamp=cell.timestamp,
+                labels_key=label_key,
+            )
+            # Cached on the long-lived cell, so formatted once per shard
+            total.label_string = cell.format_labels()
+            merged.append(total)
+        return merged
+
+    def observe(self, label_key: str, labels: Dict[str, str], values: Sequence[float]) -> None:
+        """Record histogram or summary observations sharing one label set.
+
+        Args:
+            label_key: Serialized labels of the observations
+            labels: Label dictionary
+            values: Observed values
+        """
+        if self.retain_raw_samples:
+            timestamp = _timestamp()
+            self._samples.extend(
+                MetricValue(value=value, labels=labels, timestamp=timestamp, labels_key=label_key)
+                for value in values
+            )
+
+        self._update_series(label_key, labels, values)
+        self.touch()
+
+    def _update_series(
+        self, label_key: str, labels: Dict[str, str], values: Sequence[float]
+    ) -> None:
+        """Fold observations into the running aggregates for a label set.
+
+        Args:
+            label_key: Serialized labels of the observations
+            labels: Label dictionary
+            values: Observed values
+        """
+        if self.metric_type == MetricType.SUMMARY:
+            self._update_summary(label_key, labels, values)
+            return
+
+        # Always set for histograms by __post_init__
+        buckets = self.buckets or ()
+        series = self._histogram.get(label_key)
+        if series is None:
+            series = HistogramSeries(labels=labels, bucket_counts=[0] * (len(buckets) + 1))
+            self._histogram[label_key] = series
+
+        _bin_values(series.bucket_counts, buckets, values)
+
+        # Sum in observation order so batches match one-by-one recording
+        total = series.sum
+        for value in values:
+            total += value
+        series.sum = total
+        series.count += len(values)
+
+    def _update_summary(
+        self, label_key: str, labels: Dict[str, str], values: Sequence[float]
+    ) -> None:
+        """Fold observations into a summary reservoir (Vitter's Algorithm R).
+
+        Args:
+            label_key: Serialized labels of the observations
+            labels: Label dictionary
+            values: Observed values
+        """
+        series = self._summary.get(label_key)
+        if series is None:
+            series = SummarySeries(labels=labels)
+            self._summary[label_key] = series
+
+        series.sorted_reservoir = None
+        reservoir = series.reservoir
+        for value in values:
+            series.count += 1
+            series.sum += value
+
+            if len(reservoir) < self.reservoir_size:
+                reservoir.append(value)
+            else:
+                # Keep each of the count observations with equal probability
+                slot = random.randrange(series.count)
+                if slot < self.reservoir_size:
+                    reservoir[slot] = value
+
+    def clear(self) -> None:
+        """Remove all recorded values."""
+        self._by_labels.clear()
+        for _, shard in list(self._shards):
+            shard.clear()
+        self._samples.clear()
+        self._histogram.clear()
+        self._summary.clear()
+        self.touch()
+
+
+class RWLock:
+    """Readers-writer lock.
+
+    Any number of readers may hold the lock at once; a writer waits for
+    active readers to drain and then holds it exclusively.
+    """
+
+    def __init__(self) -> None:
+        """Initialize readers-writer lock."""
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+
+    @contextmanager
+    def read_lock(self) -> Iterator[None]:
+        """Acquire the lock for shared (read) access."""
+        with self._cond:
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """Acquire the lock for exclusive (write) access."""
+        with self._cond:
+            while self._readers:
+                self._cond.wait()
+            yield
 
 
 class MetricsCollector:
@@ -69,50 +604,101 @@ class MetricsCollector:
     Supports counters, gauges, histograms, and summaries.
     """
 
-    def __init__(self, namespace: str = "shadowfs"):
+    # Default ShadowFS metrics as (name, type, description, buckets)
+    _DEFAULT_METRICS: Tuple[Tuple[str, MetricType, str, Optional[Sequence[float]]], ...] = (
+        # Operation counters
+        ("operations_total", MetricType.COUNTER, "Total number of filesystem operations", None),
+        ("errors_total", MetricType.COUNTER, "Total number of errors", None),
+        # Performance metrics
+        (
+            "operation_duration_seconds",
+            MetricType.HISTOGRAM,
+            "Duration of filesystem operations in seconds",
+            (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+        ),
+        # State gauges
+        ("cache_size_bytes", MetricType.GAUGE, "Current cache size in bytes", None),
+        ("open_files", MetricType.GAUGE, "Number of currently open files", None),
+        ("virtual_layers", MetricType.GAUGE, "Number of active virtual layers", None),
+    )
+
+    def __init__(self, namespace: str = "shadowfs", render_ttl: float = 0.0):
         """Initialize metrics collector.
 
         Args:
             namespace: Metric namespace prefix
+            render_ttl: Seconds a Prometheus export may be reused while no
+                metric has been updated (default 0, always re-render)
         """
         self.namespace = namespace
+        self.render_ttl = render_ttl
+        # Last export as (monotonic time, text); _dirty is set on every update
+        self._render_cache: Optional[Tuple[float, str]] = None
+        self._render_bytes: Optional[Tuple[str, bytes]] = None  # (text, encoded text)
+        self._dirty = True
         self._metrics: Dict[str, Metric] = {}
-        self._lock = threading.RLock()
+        # Guards the metric registry; value updates use per-metric lock stripes
+        self._lock = RWLock()
 
         # Initialize default metrics
         self._initialize_default_metrics()
 
     def _initialize_default_metrics(self) -> None:
         """Initialize default ShadowFS metrics."""
-        # Operation counters
-        self.register_counter("operations_total", "Total number of filesystem operations")
-        self.register_counter("errors_total", "Total number of errors")
+        # The registry is not shared yet, so insert directly without locking
+        for name, metric_type, description, buckets in self._DEFAULT_METRICS:
+            self._insert(
+                Metric(name=name, metric_type=metric_type, description=description, buckets=buckets)
+            )
 
-        # Performance metrics
-        self.register_histogram(
-            "operation_duration_seconds",
-            "Duration of filesystem operations in seconds",
-            buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+    def _insert(self, metric: Metric) -> None:
+        """Add a metric to the registry.
+
+        Must be called with the registry write lock held.
+
+        Args:
+            metric: Metric to add
+        """
+        metric._full_name = f"{self.namespace}_{metric.name}"
+        metric._prelude = (
+            f"# HELP {metric._full_name} {metric.description}\n"
+            f"# TYPE {metric._full_name} {metric.metric_type.value}"
         )
+        self._metrics[metric.name] = metric
+        self._dirty = True
 
-        # State gauges
-        self.register_gauge("cache_size_bytes", "Current cache size in bytes")
-        self.register_gauge("open_files", "Number of currently open files")
-        self.register_gauge("virtual_layers", "Number of active virtual layers")
+    def _register(
+        self, name: str, metric_type: MetricType, description: str, **options: Any
+    ) -> None:
+        """Register a metric unless the name is already taken.
 
-    def register_counter(self, name: str, description: str) -> None:
-        """Register a counter metric.
+        Re-registration is the common case, so the name is checked without
+        locking first and again under the write lock before inserting.
 
         Args:
             name: Metric name
+            metric_type: Metric type
             description: Metric description
+            **options: Additional Metric fields
         """
-        with self._lock:
+        if name in self._metrics:
+            return
+
+        with self._lock.write_lock():
             if name not in self._metrics:
-                self._metrics[name] = Metric(
-                    name=name, metric_type=MetricType.COUNTER, description=description
+                self._insert(
+                    Metric(name=name, metric_type=metric_type, description=description, **options)
                 )
 
+    def register_counter(self, name: str, description: str) -> None:
+        """Register a counter metric.
+
+        Args:
+            name: Metric name
+            description: Metric description
+        """
+        self._register(name, MetricType.COUNTER, description)
+
     def register_gauge(self, name: str, description: str) -> None:
         """Register a gauge metric.
 
@@ -120,14 +706,14 @@ class MetricsCollector:
             name: Metric name
             description: Metric description
         """
-        with self._lock:
-            if name not in self._metrics:
-                self._metrics[name] = Metric(
-                    name=name, metric_type=MetricType.GAUGE, description=description
-                )
+        self._register(name, MetricType.GAUGE, description)
 
     def register_histogram(
-        self, name: str, description: str, buckets: Optional[List[float]] = None
+        self,
+        name: str,
+        description: str,
+        buckets: Optional[List[float]] = None,
+        retain_raw_samples: bool = False,
     ) -> None:
         """Register a histogram metric.
 
@@ -135,28 +721,41 @@ class MetricsCollector:
             name: Metric name
             description: Metric description
             buckets: Histogram buckets (optional)
+            retain_raw_samples: Keep every observation in addition to the
+                bucket counts (default False)
         """
-        with self._lock:
-            if name not in self._metrics:
-                self._metrics[name] = Metric(
-                    name=name,
-                    metric_type=MetricType.HISTOGRAM,
-                    description=description,
-                    buckets=buckets,
-                )
+        self._register(
+            name,
+            MetricType.HISTOGRAM,
+            description,
+            buckets=buckets,
+            retain_raw_samples=retain_raw_samples,
+        )
 
-    def register_summary(self, name: str, description: str) -> None:
+    def register_summary(
+        self,
+        name: str,
+        description: str,
+        reservoir_size: int = DEFAULT_RESERVOIR_SIZE,
+        retain_raw_samples: bool = False,
+    ) -> None:
         """Register a summary metric.
 
         Args:
             name: Metric name
             description: Metric description
+            reservoir_size: Observations sampled per label set for
+                quantile estimation (default 1024)
+            retain_raw_samples: Keep every observation in addition to the
+                reservoir (default False)
         """
-        with self._lock:
-            if name not in self._metrics:
-                self._metrics[name] = Metric(
-                    name=name, metric_type=MetricType.SUMMARY, description=description
-                )
+        self._register(
+            name,
+            MetricType.SUMMARY,
+            description,
+            reservoir_size=reservoir_size,
+            retain_raw_samples=retain_raw_samples,
+        )
 
     def increment_counter(
         self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1.0
@@ -171,24 +770,22 @@ class MetricsCollector:
         if labels is None:
             labels = {}
 
-        with self._lock:
-            if name not in self._metrics:
-                return  # Metric not registered
-
-            metric = self._metrics[name]
-            if metric.metric_type != MetricType.COUNTER:
-                return  # Wrong metric type
-
-            # Find or create value for these labels
-            label_key = self._serialize_labels(labels)
-            for metric_value in metric.values:
-                if self._serialize_labels(metric_value.labels) == label_key:
-                    metric_value.value += value
-                    metric_value.timestamp = time.time()
-                    return
-
-            # Create new value
-            metric.values.append(MetricValue(value=value, labels=labels))
+        metric = self._metrics.get(name)
+        if metric is None or metric.metric_type is not MetricType.COUNTER:
+            return  # Metric not registered or wrong type
+
+        # Find or create value for these labels in this thread's shard; no
+        # other thread writes to it, so no lock is needed
+        label_key = _label_key(labels)
+        shard = metric.thread_shard()
+        metric_value = shard.get(label_key)
+        if metric_value is None:
+            shard[label_key] = MetricValue(value=value, labels=labels, labels_key=label_key)
+        else:
+            metric_value.value += value
+            metric_value.timestamp = _timestamp()
+        metric.touch()
+        self._dirty = True
 
     def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
         """Set a gauge metric value.
@@ -201,48 +798,74 @@ class MetricsCollector:
         if labels is None:
             labels = {}
 
-        with self._lock:
-            if name not in self._metrics:
-                return  # Metric not registered
-
-            metric = self._metrics[name]
-            if metric.metric_type != MetricType.GAUGE:
-                return  # Wrong metric type
-
-            # Find or create value for these labels
-            label_key = self._serialize_labels(labels)
-            for metric_value in metric.values:
-                if self._serialize_labels(metric_value.labels) == label_key:
-                    metric_value.value = value
-                    metric_value.timestamp = time.time()
+        metric = self._metrics.get(name)
+        if metric is None or metric.metric_type is not MetricType.GAUGE:
+            return  # Metric not registered or wrong type
+
+        # Existing label sets are updated in place without locking (attribute
+        # stores are atomic); only creating a new label set takes the lock
+        label_key = _label_key(labels)
+        metric_value = metric._by_labels.get(label_key)
+        if metric_value is None:
+            with metric.stripe_lock(label_key):
+                metric_value = metric._by_labels.get(label_key)
+                if metric_value is None:
+                    metric._by_labels[label_key] = MetricValue(
+                        value=value, labels=labels, labels_key=label_key
+                    )
+                    metric.touch()
+                    self._dirty = True
                     return
 
-            # Create new value
-            metric.values.append(MetricValue(value=value, labels=labels))
+        metric_value.value = value
+        metric_value.timestamp = _timestamp()
+        metric.touch()
+        self._dirty = True
 
     def record_duration(
         self, name: str, duration: float, labels: Optional[Dict[str, str]] = None
     ) -> None:
         """Record a duration for histogram/summary.
 
+        A batch of one; see record_durations.
+
         Args:
             name: Metric name
             duration: Duration in seconds
             labels: Metric labels
         """
+        self.record_durations(name, (duration,), labels)
+
+    def record_durations(
+        self, name: str, durations: Iterable[float], labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Record a batch of durations for histogram/summary.
+
+        Equivalent to recording each duration on its own, but the labels
+        are serialized, the lock is taken and raw samples are timestamped
+        once per batch.
+
+        Args:
+            name: Metric name
+            durations: Durations in seconds
+            labels: Metric labels
+        """
         if labels is None:
             labels = {}
 
-        with self._lock:
-            if name not in self._metrics:
-                return  # Metric not registered
-
-            metric = self._metrics[name]
-            if metric.metric_type not in (MetricType.HISTOGRAM, MetricType.SUMMARY):
-                return  # Wrong metric type
+        metric = self._metrics.get(name)
+        if metric is None or (
+            metric.metric_type is not MetricType.HISTOGRAM
+            and metric.metric_type is not MetricType.SUMMARY
+        ):
+            return  # Metric not registered or wrong type
 
-            # Add observation
-            metric.values.append(MetricValue(value=duration, labels=labels))
+        if not isinstance(durations, (list, tuple)):
+            durations = list(durations)
+        label_key = _label_key(labels)
+        with metric.stripe_lock(label_key):
+            metric.observe(label_key, labels, durations)
+        self._dirty = True
 
     def get_metric(self, name: str) -> Optional[Metric]:
         """Get a metric by name.
@@ -253,76 +876,140 @@ class MetricsCollector:
         Returns:
             Metric or None if not found
         """
-        with self._lock:
-            return self._metrics.get(name)
+        return self._metrics.get(name)
 
     def clear_metrics(self) -> None:
         """Clear all metric values."""
-        with self._lock:
+        with self._lock.read_lock():
             for metric in self._metrics.values():
-                metric.values.clear()
+                with metric.locked():
+                    metric.clear()
+        self._dirty = True
 
     def export_prometheus(self) -> str:
         """Export metrics in Prometheus format.
 
+        With a positive ``render_ttl`` the previous export is returned as
+        long as it is younger than the TTL and no metric has been updated
+        through the collector since it was rendered.
+
         Returns:
             Metrics in Prometheus text format
         """
-        with self._lock:
-            lines = []
+        with self._lock.read_lock():
+            if self.render_ttl <= 0:
+                return self._render_prometheus()
+            return self._cached_render()
 
-            for metric in self._metrics.values():
-                # Add metric help and type
-                lines.append(f"# HELP {self.namespace}_{metric.name} {metric.description}")
-                lines.append(f"# TYPE {self.namespace}_{metric.name} {metric.metric_type.value}")
-
-                if metric.metric_type in (MetricType.COUNTER, MetricType.GAUGE):
-                    # Export simple values
-                    for value in metric.values:
-                        label_str = self._format_labels(value.labels)
-                        lines.append(f"{self.namespace}_{metric.name}{label_str} {value.value}")
-
-                elif metric.metric_type == MetricType.HISTOGRAM:
-                    # Export histogram buckets and statistics
-                    histogram_data = self._aggregate_histogram(metric)
-                    for labels, buckets, count, sum_value in histogram_data:
-                        label_str = self._format_labels(labels)
-
-                        # Export buckets
-                        for bucket_limit, bucket_count in buckets:
-                            bucket_labels = dict(labels)
-                            bucket_labels["le"] = str(bucket_limit)
-                            bucket_label_str = self._format_labels(bucket_labels)
-                            lines.append(
-                                f"{self.namespace}_{metric.name}_bucket{bucket_label_str} {bucket_count}"
-                            )
-
-                        # Export count and sum
-                        lines.append(f"{self.namespace}_{metric.name}_count{label_str} {count}")
-                        lines.append(f"{self.namespace}_{metric.name}_sum{label_str} {sum_value}")
-
-                elif metric.metric_type == MetricType.SUMMARY:
-                    # Export summary statistics
-                    summary_data = self._aggregate_summary(metric)
-                    for labels, quantiles, count, sum_value in summary_data:
-                        label_str = self._format_labels(labels)
-
-                        # Export quantiles
-                        for quantile, value in quantiles:
-                            quantile_labels = dict(labels)
-                            quantile_labels["quantile"] = str(quantile)
-                            quantile_label_str = self._format_labels(quantile_labels)
-                            lines.append(
-                                f"{self.namespace}_{metric.name}{quantile_label_str} {value}"
-                            )
-
-                        # Export count and sum
-                        lines.append(f"{self.namespace}_{metric.name}_count{label_str} {count}")
-                        lines.append(f"{self.namespace}_{metric.name}_sum{label_str} {sum_value}")
-
-                lines.append("")  # Empty line between metrics
-
-            return "\n".join(lines)
+    def export_prometheus_bytes(self) -> bytes:
+        """Export metrics in Prometheus format as UTF-8 bytes.
+
+        Suitable for writing straight to a scrape response. When the text
+        export is served from the render cache, its encoding is cached too.
+
+        Returns:
+            Metrics in Prometheus text format, UTF-8 encoded
+        """
+        with self._lock.read_lock():
+            if self.render_ttl <= 0:
+                return self._render_prometheus().encode()
+
+            text = self._cached_render()
+            cached = self._render_bytes
+            if cached is None or cached[0] is not text:
+                cached = (text, text.encode())
+                self._render_bytes = cached
+            return cached[1]
+
+    def _cached_render(self) -> str:
+        """Return the cached export, re-rendering it if stale or dirty.
+
+        Must be called with the registry read lock held.
+
+        Returns:
+            Metrics in Prometheus text format
+        """
+        now = time.monotonic()
+        cached = self._render_cache
+        if cached is not None and not self._dirty and now - cached[0] < self.render_ttl:
+            return cached[1]
+
+        # Clear the flag before rendering so concurrent updates re-dirty it
+        self._dirty = False
+        output = self._render_prometheus()
+        self._render_cache = (now, output)
+        return output
+
+    def _render_prometheus(self) -> str:
+        """Render all registered metrics in Prometheus text format.
+
+        Each metric's section is cached with the version it was rendered at
+        and reused until the metric is next updated.
+
+        Must be called with the registry read lock held.
+
+        Returns:
+            Metrics in Prometheus text format
+        """
+        sections: List[str] = []
+
+        for metric in self._metrics.values():
+            # Read the version before rendering so a concurrent update
+            # leaves the section stale rather than wrongly current
+            version = metric._version
+            cached = metric._rendered
+            if cached is None or cached[0] != version:
+                with metric._lock:
+                    cached = (version, self._render_metric(metric))
+                metric._rendered = cached
+            sections.append(cached[1])
+
+        return "\n".join(sections)
+
+    def _render_metric(self, metric: Metric) -> str:
+        """Render one metric's section in Prometheus text format.
+
+        Args:
+            metric: Metric to render
+
+        Returns:
+            HELP and TYPE lines followed by the samples, newline-terminated
+        """
+        full_name = metric._full_name
+
+        # Add metric help and type
+        lines = [metric._prelude]
+
+        if metric.metric_type in (MetricType.COUNTER, MetricType.GAUGE):
+            if metric.metric_type is MetricType.COUNTER:
+                metric.fold_dead_shards()
+
+            # Export simple values
+            for value in metric.values:
+                label_str = value.format_labels()
+                lines.append(f"{full_name}{label_str} {_format_value(value.value)}")
+
+        else:
+            # Export histogram buckets or summary quantiles, then statistics
+            if metric.metric_type is MetricType.HISTOGRAM:
+                point_name, extra = f"{full_name}_bucket", "le"
+            else:
+                point_name, extra = full_name, "quantile"
+
+            for labels, points, count, sum_value in self._aggregate(metric).values():
+                label_str = self._format_labels(labels)
+                head, tail = self._label_template(labels, extra)
+
+                for point, point_value in points:
+                    lines.append(
+                        f'{point_name}{head}{extra}="{point}"{tail} {_format_value(point_value)}'
+                    )
+
+                lines.append(f"{full_name}_count{label_str} {count}")
+                lines.append(f"{full_name}_sum{label_str} {_format_value(sum_value)}")
+
+        lines.append("")  # Empty line between metrics
+        return "\n".join(lines)
 
     def _serialize_labels(self, labels: Dict[str, str]) -> str:
         """Serialize labels to a consistent string key.
@@ -333,10 +1020,7 @@ class MetricsCollector:
         Returns:
             Serialized label string
         """
-        if not labels:
-            return ""
-        items = sorted(labels.items())
-        return ",".join(f"{k}={v}" for k, v in items)
+        return _label_key(labels)
 
     def _format_labels(self, labels: Dict[str, str]) -> str:
         """Format labels for Prometheus export.
@@ -347,56 +1031,87 @@ class MetricsCollector:
         Returns:
             Formatted label string
         """
-        if not labels:
-            return ""
-        items = sorted(labels.items())
-        label_parts = [f'{k}="{v}"' for k, v in items]
-        return "{" + ",".join(label_parts) + "}"
+        return _format_labels(labels)
 
-    def _aggregate_histogram(
-        self, metric: Metric
-    ) -> List[Tuple[Dict[str, str], List[Tuple[float, int]], int, float]]:
-        """Aggregate histogram values by labels.
+    def _label_template(self, labels: Dict[str, str], extra: str) -> Tuple[str, str]:
+        """Split formatted labels around the sorted position of an extra label.
+
+        Lets per-bucket (``le``) and per-quantile label strings be built by
+        concatenation instead of copying and re-sorting the labels each time.
 
         Args:
-            metric: Histogram metric
+            labels: Label dictionary
+            extra: Name of the label inserted per line
 
         Returns:
-            List of (labels, buckets, count, sum) tuples
+            (head, tail) such that ``head + f'{extra}="v"' + tail`` is the
+            formatted label string
         """
-        # Group values by labels
-        groups: Dict[str, List[float]] = defaultdict(list)
-        for value in metric.values:
-            label_key = self._serialize_labels(value.labels)
-            groups[label_key].append(value.value)
-
-        results = []
-        for label_key, values in groups.items():
-            # Parse labels back
-            labels = {}
-            if label_key:
-                for part in label_key.split(","):
-                    if "=" in part:
-                        k, v = part.split("=", 1)
-                        labels[k] = v
+        return _prometheus_label_template(frozenset(labels.items()), extra)
 
-            # Calculate bucket counts
-            buckets = []
-            for bucket_limit in metric.buckets:
-                count = sum(1 for v in values if v <= bucket_limit)
-                buckets.append((bucket_limit, count))
+    def _aggregate(
+        self, metric: Metric
+    ) -> Dict[str, Tuple[Dict[str, str], List[Tuple[float, float]], int, float]]:
+        """Snapshot the running aggregates of a histogram or summary.
 
-            # Add infinity bucket
-            buckets.append((float("inf"), len(values)))
+        Histogram points are cumulative (le, count) pairs ending with +Inf;
+        summary points are (quantile, value) pairs estimated from the
+        reservoir sample.
 
-            # Calculate total count and sum
-            total_count = len(values)
-            total_sum = sum(values)
+        Args:
+            metric: Histogram or summary metric
 
-            results.append((labels, buckets, total_count, total_sum))
+        Returns:
+            Label key to (labels, points, count, sum) map
+        """
+        results: Dict[str, Tuple[Dict[str, str], List[Tuple[float, float]], int, float]] = {}
+        if metric.metric_type is MetricType.HISTOGRAM:
+            buckets = metric.buckets or ()
+            for label_key, histogram in list(metric._histogram.items()):
+                with metric.stripe_lock(label_key):
+                    bucket_counts = list(histogram.bucket_counts)
+                    count, sum_value = histogram.count, histogram.sum
+
+                # Accumulate per-bucket counts into cumulative (le) counts
+                bucket_points: List[Tuple[float, float]] = []
+                cumulative = 0
+                for bucket_limit, bucket_count in zip(buckets, bucket_counts):
+                    cumulative += bucket_count
+                    bucket_points.append((bucket_limit, cumulative))
+
+                # Add infinity bucket
+                bucket_points.append((float("inf"), count))
+
+                results[label_key] = (histogram.labels, bucket_points, count, sum_value)
+        else:
+            for label_key, summary in list(metric._summary.items()):
+                with metric.stripe_lock(label_key):
+                    sorted_values = summary.sorted_reservoir
+                    if sorted_values is None:
+                        sorted_values = summary.sorted_reservoir = sorted(summary.reservoir)
+                    count, sum_value = summary.count, summary.sum
+
+                quantile_points = _quantiles(sorted_values, SUMMARY_QUANTILES)
+                results[label_key] = (summary.labels, quantile_points, count, sum_value)
 
         return results
 
+    def _aggregate_histogram(
+        self, metric: Metric
+    ) -> List[Tuple[Dict[str, str], List[Tuple[float, int]], int, float]]:
+        """Aggregate histogram values by labels.
+
+        Args:
+            metric: Histogram metric
+
+        Returns:
+            List of (labels, buckets, count, sum) tuples
+        """
+        return [
+            (dict(labels), [(le, int(n)) for le, n in buckets], count, sum_value)
+            for labels, buckets, count, sum_value in self._aggregate(metric).values()
+        ]
+
     def _aggregate_summary(
         self, metric: Metric
     ) -> List[Tuple[Dict[str, str], List[Tuple[float, float]], int, float]]:
@@ -408,38 +1123,10 @@ class MetricsCollector:
         Returns:
             List of (labels, quantiles, count, sum) tuples
         """
-        # Group values by labels
-        groups: Dict[str, List[float]] = defaultdict(list)
-        for value in metric.values:
-            label_key = self._serialize_labels(value.labels)
-            groups[label_key].append(value.value)
-
-        results = []
-        for label_key, values in groups.items():
-            # Parse labels back
-            labels = {}
-            if label_key:
-                for part in label_key.split(","):
-                    if "=" in part:
-                        k, v = part.split("=", 1)
-                        labels[k] = v
-
-            # Calculate quantiles (0.5, 0.9, 0.99)
-            sorted_values = sorted(values)
-            quantiles = []
-
-            for q in [0.5, 0.9, 0.99]:
-                idx = int(len(sorted_values) * q)
-                if idx < len(sorted_values):
-                    quantiles.append((q, sorted_values[idx]))
-
-            # Calculate total count and sum
-            total_count = len(values)
-            total_sum = sum(values)
-
-            results.append((labels, quantiles, total_count, total_sum))
-
-        return results
+        return [
+            (dict(labels), quantiles, count, sum_value)
+            for labels, quantiles, count, sum_value in self._aggregate(metric).values()
+        ]
 
 
 # Global metrics instance
@@ -58,9 +58,10 @@ def normalize_path(path: str) -> str:
     if path.startswith("~"):
         path = os.path.expanduser(path)
 
-    # Use pathlib for normalization
+    # realpath is what Path.resolve() wraps, minus the Path construction and
+    # the extra stat it makes to turn symlink loops into RuntimeError
     try:
-        normalized = str(Path(path).resolve())
+        normalized = os.path.realpath(path)
     except (OSError, ValueError) as e:
         raise PathError(f"Invalid path: {e}", ErrorCode.INVALID_INPUT)
 
@@ -6,29 +6,156 @@ paths, patterns, and other user inputs.
 
 Following Meta-Architecture v1.0.0 principles.
 """
+import hashlib
+import pickle
 import re
-from typing import Any, Dict, Pattern, Union
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Pattern, Tuple, Union
 
 from shadowfs.core.constants import ConfigKey, ErrorCode, LayerType, Limits, RuleType, TransformType
 
+# Control characters other than tab, newline and carriage return.
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]", re.ASCII)
+# Matched with fullmatch, so a trailing newline is rejected (unlike "$" with match).
+# re.ASCII keeps \d to 0-9; Unicode digits such as "\u0661" are not version numbers.
+_LAYER_NAME_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9_-]*", re.ASCII)
+_OCTAL_MODE_RE = re.compile(r"(?:0[oO])?([0-7]+)", re.ASCII)
+_VERSION_RE = re.compile(r"\d+\.\d+(\.\d+)?", re.ASCII)
+
+# Accepted values for enumerated configuration fields. Enum-typed fields accept
+# either the member or its string value.
+_CACHE_FIELDS = frozenset(
+    {ConfigKey.CACHE_ENABLED, ConfigKey.CACHE_SIZE_MB, ConfigKey.CACHE_TTL, "eviction_policy"}
+)
+_EVICTION_POLICIES = frozenset({"lru", "lfu", "fifo"})
+_LAYER_TYPES = frozenset(LayerType).union(t.value for t in LayerType)
+_RULE_TYPES = frozenset(RuleType).union(t.value for t in RuleType)
+_TRANSFORM_TYPES = frozenset(TransformType).union(t.value for t in TransformType)
+
+# Distinguishes an absent configuration key from one explicitly set to None.
+_MISSING = object()
+
+# Digests of configurations that already passed validate_config, oldest first.
+CONFIG_CACHE_SIZE = 128
+_validate_config_cache: Dict[bytes, bool] = {}
+
+
+@lru_cache(maxsize=512)
+def _compile_cached(pattern: str) -> Pattern[str]:
+    """Compile a regex pattern, remembering the result.
+
+    Patterns that fail to compile raise ``re.error`` and are not cached.
+
+    Args:
+        pattern: Regex pattern string
+
+    Returns:
+        Compiled regex pattern
+    """
+    return re.compile(pattern)
+
+
+def _is_choice(value: Any, choices: FrozenSet[Any]) -> bool:
+    """Check membership of a possibly unhashable value in a set of choices.
+
+    Args:
+        value: Value to look up
+        choices: Accepted values
+
+    Returns:
+        True if value is one of choices
+    """
+    try:
+        return value in choices
+    except TypeError:  # Unhashable values cannot be choices
+        return False
+
 
 class ValidationError(Exception):
-    """Base exception for validation errors."""
+    """Base exception for validation errors.
+
+    The message may be a ``str.format`` template whose fields are passed as
+    keyword arguments. It is only formatted when the error is rendered, so
+    callers that catch and discard failures never pay for the formatting.
+    """
 
-    def __init__(self, message: str, error_code: ErrorCode = ErrorCode.INVALID_INPUT):
+    def __init__(
+        self, message: str, error_code: ErrorCode = ErrorCode.INVALID_INPUT, **details: Any
+    ):
         """Initialize ValidationError.
 
         Args:
-            message: Error message
+            message: Error message, or a template formatted with ``details``
             error_code: Associated error code
+            **details: Values substituted into the message template
         """
         super().__init__(message)
         self.error_code = error_code
+        self.details = details
+
+    @property
+    def code(self) -> ErrorCode:
+        """Error code for dispatching on the failure without parsing the message."""
+        return self.error_code
+
+    @cached_property
+    def lower_message(self) -> str:
+        """Lower-cased message, computed once for case-insensitive matching."""
+        return str(self).lower()
+
+    def __str__(self) -> str:
+        """Return the error message, formatting the template on demand."""
+        message: str = self.args[0]
+        if self.details:
+            formatted: str = message.format(**self.details)
+            return formatted
+        return message
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle with the error code and template details.
+
+        ``args`` only holds the message template, so the default reduction
+        would rebuild the error without them.
+        """
+        return (type(self), (self.args[0], self.error_code), self.__dict__)
 
 
 def validate_config(config: Dict[str, Any]) -> bool:
     """Validate ShadowFS configuration structure.
 
+    Configurations that pass are remembered by a digest of their pickled
+    contents, so re-validating an unchanged configuration (e.g. on every
+    hot-reload poll) is a single lookup. The most recent
+    ``CONFIG_CACHE_SIZE`` digests are kept; failures are never cached.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        True if valid
+
+    Raises:
+        ValidationError: If configuration is invalid
+    """
+    try:
+        payload = pickle.dumps(config, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return _validate_config(config)
+
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    if digest in _validate_config_cache:
+        return True
+
+    result = _validate_config(config)
+    if len(_validate_config_cache) >= CONFIG_CACHE_SIZE:
+        _validate_config_cache.pop(next(iter(_validate_config_cache)), None)
+    _validate_config_cache[digest] = result
+    return result
+
+
+def _validate_config(config: Dict[str, Any]) -> bool:
+    """Validate a configuration without consulting the digest cache.
+
     Args:
         config: Configuration dictionary
 
@@ -42,68 +169,69 @@ def validate_config(config: Dict[str, Any]) -> bool:
         raise ValidationError("Configuration must be a dictionary")
 
     # Check required version
-    if ConfigKey.VERSION not in config:
+    version = config.get(ConfigKey.VERSION, _MISSING)
+    if version is _MISSING:
         raise ValidationError("Configuration must have 'version' field")
 
-    version = config[ConfigKey.VERSION]
     validate_version(version)  # Raises ValidationError on failure
 
     # Validate sources
-    if ConfigKey.SOURCES in config:
-        sources = config[ConfigKey.SOURCES]
-        if not isinstance(sources, list):
-            raise ValidationError("Sources must be a list")
-
-        for i, source in enumerate(sources):
-            try:
-                validate_source_config(source)
-            except ValidationError as e:
-                raise ValidationError(f"Invalid source configuration at index {i}: {e}")
+    sources = config.get(ConfigKey.SOURCES, _MISSING)
+    if sources is not _MISSING:
+        _validate_list(sources, "Sources", "source", validate_source_config)
 
     # Validate rules
-    if ConfigKey.RULES in config:
-        rules = config[ConfigKey.RULES]
-        if not isinstance(rules, list):
-            raise ValidationError("Rules must be a list")
-
-        for i, rule in enumerate(rules):
-            try:
-                validate_rule_config(rule)
-            except ValidationError as e:
-                raise ValidationError(f"Invalid rule configuration at index {i}: {e}")
+    rules = config.get(ConfigKey.RULES, _MISSING)
+    if rules is not _MISSING:
+        _validate_list(rules, "Rules", "rule", validate_rule_config)
 
     # Validate transforms
-    if ConfigKey.TRANSFORMS in config:
-        transforms = config[ConfigKey.TRANSFORMS]
-        if not isinstance(transforms, list):
-            raise ValidationError("Transforms must be a list")
-
-        for i, transform in enumerate(transforms):
-            try:
-                validate_transform_config(transform)
-            except ValidationError as e:
-                raise ValidationError(f"Invalid transform configuration at index {i}: {e}")
+    transforms = config.get(ConfigKey.TRANSFORMS, _MISSING)
+    if transforms is not _MISSING:
+        _validate_list(transforms, "Transforms", "transform", validate_transform_config)
 
     # Validate virtual layers
-    if ConfigKey.VIRTUAL_LAYERS in config:
-        layers = config[ConfigKey.VIRTUAL_LAYERS]
-        if not isinstance(layers, list):
-            raise ValidationError("Virtual layers must be a list")
-
-        for i, layer in enumerate(layers):
-            try:
-                validate_virtual_layer_config(layer)
-            except ValidationError as e:
-                raise ValidationError(f"Invalid virtual layer configuration at index {i}: {e}")
+    layers = config.get(ConfigKey.VIRTUAL_LAYERS, _MISSING)
+    if layers is not _MISSING:
+        _validate_list(layers, "Virtual layers", "virtual layer", validate_virtual_layer_config)
 
     # Validate cache config
-    if ConfigKey.CACHE in config:
-        cache = config[ConfigKey.CACHE]
+    cache = config.get(ConfigKey.CACHE, _MISSING)
+    if cache is not _MISSING:
         validate_cache_config(cache)  # Raises ValidationError on failure
 
     return True
 
 
+def _validate_list(
+    items: Any, plural: str, singular: str, validate_item: Callable[[Any], bool]
+) -> None:
+    """Validate a configuration section that holds a list of entries.
+
+    Args:
+        items: Section value from the configuration
+        plural: Capitalized section name for the type error (e.g. "Sources")
+        singular: Entry name for per-entry errors (e.g. "source")
+        validate_item: Validator applied to each entry
+
+    Raises:
+        ValidationError: If items is not a list or an entry is invalid
+    """
+    if not isinstance(items, list):
+        raise ValidationError("{plural} must be a list", plural=plural)
+
+    for i, item in enumerate(items):
+        try:
+            validate_item(item)
+        except ValidationError as e:
+            raise ValidationError(
+                "Invalid {singular} configuration at index {index}: {cause}",
+                singular=singular,
+                index=i,
+                cause=e,
+            )
+
+
 def validate_source_config(source: Dict[str, Any]) -> bool:
     """Validate source configuration.
 
@@ -130,13 +258,15 @@ def validate_source_config(source: Dict[str, Any]) -> bool:
     if ConfigKey.SOURCE_PRIORITY in source:
         priority = source[ConfigKey.SOURCE_PRIORITY]
         if not isinstance(priority, int) or priority < 0:
-            raise ValidationError(f"Source priority must be non-negative integer: {priority}")
+            raise ValidationError(
+                "Source priority must be non-negative integer: {priority}", priority=priority
+            )
 
     # Optional field: readonly (boolean)
     if ConfigKey.SOURCE_READONLY in source:
         readonly = source[ConfigKey.SOURCE_READONLY]
         if not isinstance(readonly, bool):
-            raise ValidationError(f"Source readonly must be boolean: {readonly}")
+            raise ValidationError("Source readonly must be boolean: {readonly}", readonly=readonly)
 
     return True
 
@@ -161,11 +291,13 @@ def validate_rule_config(rule: Dict[str, Any]) -> bool:
         raise ValidationError("Rule must have 'type' field")
 
     rule_type = rule[ConfigKey.RULE_TYPE]
-    try:
-        RuleType(rule_type)
-    except ValueError:
+    if not _is_choice(rule_type, _RULE_TYPES):
         valid_types = [t.value for t in RuleType]
-        raise ValidationError(f"Invalid rule type: {rule_type}. Must be one of {valid_types}")
+        raise ValidationError(
+            "Invalid rule type: {rule_type}. Must be one of {valid_types}",
+            rule_type=rule_type,
+            valid_types=valid_types,
+        )
 
     # Must have pattern or patterns
     has_pattern = ConfigKey.RULE_PATTERN in rule
@@ -188,13 +320,13 @@ def validate_rule_config(rule: Dict[str, Any]) -> bool:
             try:
                 validate_pattern(pattern)
             except ValidationError as e:
-                raise ValidationError(f"Invalid pattern in list: {e}")
+                raise ValidationError("Invalid pattern in list: {cause}", cause=e)
 
     # Optional field: priority (integer)
     if "priority" in rule:
         priority = rule["priority"]
         if not isinstance(priority, int):
-            raise ValidationError(f"Rule priority must be integer: {priority}")
+            raise ValidationError("Rule priority must be integer: {priority}", priority=priority)
 
     return True
 
@@ -219,12 +351,12 @@ def validate_transform_config(transform: Dict[str, Any]) -> bool:
         raise ValidationError("Transform must have 'type' field")
 
     transform_type = transform[ConfigKey.TRANSFORM_TYPE]
-    try:
-        TransformType(transform_type)
-    except ValueError:
+    if not _is_choice(transform_type, _TRANSFORM_TYPES):
         valid_types = [t.value for t in TransformType]
         raise ValidationError(
-            f"Invalid transform type: {transform_type}. Must be one of {valid_types}"
+            "Invalid transform type: {transform_type}. Must be one of {valid_types}",
+            transform_type=transform_type,
+            valid_types=valid_types,
         )
 
     # Required field: pattern
@@ -264,19 +396,19 @@ def validate_virtual_layer_config(layer: Dict[str, Any]) -> bool:
         raise ValidationError("Virtual layer must have 'type' field")
 
     layer_type = layer["type"]
-    try:
-        LayerType(layer_type)
-    except ValueError:
+    if not _is_choice(layer_type, _LAYER_TYPES):
         valid_types = [t.value for t in LayerType]
         raise ValidationError(
-            f"Invalid virtual layer type: {layer_type}. Must be one of {valid_types}"
+            "Invalid virtual layer type: {layer_type}. Must be one of {valid_types}",
+            layer_type=layer_type,
+            valid_types=valid_types,
         )
 
     # Optional field: enabled (boolean)
     if "enabled" in layer:
         enabled = layer["enabled"]
         if not isinstance(enabled, bool):
-            raise ValidationError(f"Layer enabled must be boolean: {enabled}")
+            raise ValidationError("Layer enabled must be boolean: {enabled}", enabled=enabled)
 
     return True
 
@@ -297,43 +429,42 @@ def validate_cache_config(cache: Dict[str, Any]) -> bool:
         raise ValidationError("Cache configuration must be a dictionary")
 
     # Check for unknown fields
-    valid_fields = {
-        ConfigKey.CACHE_ENABLED,
-        ConfigKey.CACHE_SIZE_MB,
-        ConfigKey.CACHE_TTL,
-        "eviction_policy",
-    }
-    unknown_fields = set(cache.keys()) - valid_fields
+    unknown_fields = cache.keys() - _CACHE_FIELDS
     if unknown_fields:
-        raise ValidationError(f"Unknown cache configuration fields: {', '.join(unknown_fields)}")
+        raise ValidationError(
+            "Unknown cache configuration fields: {fields}", fields=", ".join(unknown_fields)
+        )
 
     # Optional field: enabled (boolean)
     if ConfigKey.CACHE_ENABLED in cache:
         enabled = cache[ConfigKey.CACHE_ENABLED]
         if not isinstance(enabled, bool):
-            raise ValidationError(f"Cache enabled must be boolean: {enabled}")
+            raise ValidationError("Cache enabled must be boolean: {enabled}", enabled=enabled)
 
     # Optional field: size_mb (positive integer)
     if ConfigKey.CACHE_SIZE_MB in cache:
         size_mb = cache[ConfigKey.CACHE_SIZE_MB]
         if not isinstance(size_mb, (int, float)) or size_mb <= 0:
-            raise ValidationError(f"Cache max_size_mb must be positive number: {size_mb}")
+            raise ValidationError(
+                "Cache max_size_mb must be positive number: {size_mb}", size_mb=size_mb
+            )
 
     # Optional field: ttl_seconds (positive integer)
     if ConfigKey.CACHE_TTL in cache:
         ttl = cache[ConfigKey.CACHE_TTL]
         if not isinstance(ttl, (int, float)) or ttl <= 0:
-            raise ValidationError(f"Cache TTL must be positive number: {ttl}")
+            raise ValidationError("Cache TTL must be positive number: {ttl}", ttl=ttl)
 
     # Optional field: eviction_policy (string: lru, lfu, fifo)
     if "eviction_policy" in cache:
         policy = cache["eviction_policy"]
         if not isinstance(policy, str):
-            raise ValidationError(f"Cache eviction policy must be string: {policy}")
-        valid_policies = {"lru", "lfu", "fifo"}
-        if policy not in valid_policies:
+            raise ValidationError("Cache eviction policy must be string: {policy}", policy=policy)
+        if policy not in _EVICTION_POLICIES:
             raise ValidationError(
-                f"Invalid eviction policy: {policy}. Must be one of {valid_policies}"
+                "Invalid eviction policy: {policy}. Must be one of {valid_policies}",
+                policy=policy,
+                valid_policies=sorted(_EVICTION_POLICIES),
             )
 
     return True
@@ -351,26 +482,25 @@ def validate_path(path: str) -> bool:
     Raises:
         ValidationError: If path is invalid
     """
+    if not isinstance(path, str):
+        raise ValidationError("Path must be string, got {value_type}", value_type=type(path))
+
     if not path:
         raise ValidationError("Path cannot be empty")
 
-    if not isinstance(path, str):
-        raise ValidationError(f"Path must be string, got {type(path)}")
-
     # Check length
     if len(path) > Limits.MAX_PATH_LENGTH:
-        raise ValidationError(f"Path exceeds maximum length ({Limits.MAX_PATH_LENGTH})")
-
-    # Check for null bytes
-    if "\0" in path:
-        raise ValidationError("Path contains null bytes")
+        raise ValidationError("Path exceeds maximum length ({limit})", limit=Limits.MAX_PATH_LENGTH)
 
-    # Check for control characters
-    if any(ord(c) < 32 and c not in "\t\n\r" for c in path):
-        raise ValidationError("Path contains control characters")
+    # Printable strings contain neither null bytes nor control characters
+    if not path.isprintable():
+        if "\0" in path:
+            raise ValidationError("Path contains null bytes")
+        if _CONTROL_CHARS_RE.search(path):
+            raise ValidationError("Path contains control characters")
 
-    # Check for path traversal attempts
-    if ".." in path:
+    # Check for path traversal attempts: ".." as a whole path segment
+    if ".." in path and "/../" in f"/{path}/":
         raise ValidationError("Path traversal not allowed")
 
     return True
@@ -388,31 +518,32 @@ def validate_pattern(pattern: str) -> bool:
     Raises:
         ValidationError: If pattern is invalid
     """
+    if not isinstance(pattern, str):
+        raise ValidationError("Pattern must be string, got {value_type}", value_type=type(pattern))
+
     if not pattern:
         raise ValidationError("Pattern cannot be empty")
 
-    if not isinstance(pattern, str):
-        raise ValidationError(f"Pattern must be string, got {type(pattern)}")
-
     # Check length
     if len(pattern) > Limits.MAX_PATH_LENGTH:
-        raise ValidationError(f"Pattern exceeds maximum length ({Limits.MAX_PATH_LENGTH})")
-
-    # Check for null bytes
-    if "\0" in pattern:
-        raise ValidationError("Invalid pattern: contains null bytes")
+        raise ValidationError(
+            "Pattern exceeds maximum length ({limit})", limit=Limits.MAX_PATH_LENGTH
+        )
 
-    # Check for control characters
-    if any(ord(c) < 32 and c not in "\t\n\r" for c in pattern):
-        raise ValidationError("Invalid pattern: contains control characters")
+    # Printable strings contain neither null bytes nor control characters
+    if not pattern.isprintable():
+        if "\0" in pattern:
+            raise ValidationError("Invalid pattern: contains null bytes")
+        if _CONTROL_CHARS_RE.search(pattern):
+            raise ValidationError("Invalid pattern: contains control characters")
 
     # Try to compile as regex to check validity
     if pattern.startswith("regex:"):
         regex_pattern = pattern[6:]  # Remove "regex:" prefix
         try:
-            re.compile(regex_pattern)
+            _compile_cached(regex_pattern)
         except re.error as e:
-            raise ValidationError(f"Invalid regex pattern: {e}")
+            raise ValidationError("Invalid regex pattern: {cause}", cause=e)
 
     return True
 
@@ -429,23 +560,23 @@ def validate_layer_name(name: str) -> bool:
     Raises:
         ValidationError: If name is invalid
     """
+    if not isinstance(name, str):
+        raise ValidationError("Layer name must be string, got {value_type}", value_type=type(name))
+
     if not name:
         raise ValidationError("Layer name cannot be empty")
 
-    if not isinstance(name, str):
-        raise ValidationError(f"Layer name must be string, got {type(name)}")
+    # Check length
+    if len(name) > 100:
+        raise ValidationError("Layer name exceeds maximum length (100)")
 
     # Must be valid directory name
-    if not re.match(r"^[a-zA-Z][a-zA-Z0-9_-]*$", name):
+    if not _LAYER_NAME_RE.fullmatch(name):
         raise ValidationError(
             "Invalid layer name: must start with letter and contain only letters, "
             "numbers, underscore, and hyphen"
         )
 
-    # Check length
-    if len(name) > 100:
-        raise ValidationError("Layer name exceeds maximum length (100)")
-
     return True
 
 
@@ -461,15 +592,17 @@ def validate_version(version: str) -> bool:
     Raises:
         ValidationError: If version is invalid
     """
+    if not isinstance(version, str):
+        raise ValidationError("Version must be string, got {value_type}", value_type=type(version))
+
     if not version:
         raise ValidationError("Version cannot be empty")
 
-    if not isinstance(version, str):
-        raise ValidationError(f"Version must be string, got {type(version)}")
-
     # Simple semantic version check (X.Y or X.Y.Z)
-    if not re.match(r"^\d+\.\d+(\.\d+)?$", version):
-        raise ValidationError(f"Invalid version format: {version}. Expected X.Y or X.Y.Z")
+    if not _VERSION_RE.fullmatch(version):
+        raise ValidationError(
+            "Invalid version format: {version}. Expected X.Y or X.Y.Z", version=version
+        )
 
     return True
 
@@ -486,13 +619,21 @@ def validate_port(port: Union[int, str]) -> bool:
     Raises:
         ValidationError: If port is invalid
     """
-    try:
+    if type(port) is int:
+        port_num = port
+    elif isinstance(port, str):
+        # isdecimal() accepts exactly the digit strings int() can parse
+        if not port.isdecimal():
+            raise ValidationError("Port must be numeric, got {value_type}", value_type=type(port))
         port_num = int(port)
-    except (ValueError, TypeError):
-        raise ValidationError(f"Port must be numeric, got {type(port)}")
+    else:
+        try:
+            port_num = int(port)
+        except (ValueError, TypeError):
+            raise ValidationError("Port must be numeric, got {value_type}", value_type=type(port))
 
     if port_num < 1 or port_num > 65535:
-        raise ValidationError(f"Port must be in range 1-65535, got {port_num}")
+        raise ValidationError("Port must be in range 1-65535, got {port_num}", port_num=port_num)
 
     return True
 
@@ -509,14 +650,14 @@ def validate_file_size(size: Union[int, float]) -> bool:
     Raises:
         ValidationError: If size is invalid
     """
-    if not isinstance(size, (int, float)):
-        raise ValidationError(f"Size must be numeric, got {type(size)}")
+    if type(size) is not int and not isinstance(size, (int, float)):
+        raise ValidationError("Size must be numeric, got {value_type}", value_type=type(size))
 
     if size < 0:
-        raise ValidationError(f"Size cannot be negative: {size}")
+        raise ValidationError("Size cannot be negative: {size}", size=size)
 
     if size > Limits.MAX_FILE_SIZE:
-        raise ValidationError(f"Size exceeds maximum ({Limits.MAX_FILE_SIZE})")
+        raise ValidationError("Size exceeds maximum ({limit})", limit=Limits.MAX_FILE_SIZE)
 
     return True
 
@@ -525,7 +666,7 @@ def validate_permissions(mode: Union[int, str]) -> bool:
     """Validate file permissions mode.
 
     Args:
-        mode: Permission mode (octal int or string)
+        mode: Permission mode (int, or octal string); bools and floats are rejected
 
     Returns:
         True if valid
@@ -533,21 +674,22 @@ def validate_permissions(mode: Union[int, str]) -> bool:
     Raises:
         ValidationError: If mode is invalid
     """
-    try:
-        if isinstance(mode, str):
-            # Convert octal string to int
-            if mode.startswith("0o"):
-                mode_int = int(mode, 8)
-            else:
-                mode_int = int(mode, 8)
-        else:
-            mode_int = int(mode)
-    except (ValueError, TypeError):
-        raise ValidationError(f"Invalid permission mode (must be octal): {mode}")
+    if type(mode) is int or (isinstance(mode, int) and not isinstance(mode, bool)):
+        mode_int = mode
+    elif isinstance(mode, str):
+        # Octal digits with an optional "0o" prefix
+        match = _OCTAL_MODE_RE.fullmatch(mode)
+        if match is None:
+            raise ValidationError("Invalid permission mode (must be octal): {mode}", mode=mode)
+        mode_int = int(match.group(1), 8)
+    else:
+        raise ValidationError("Invalid permission mode (must be octal): {mode}", mode=mode)
 
     # Check valid range (0-0777)
-    if mode_int < 0 or mode_int > 0o777:
-        raise ValidationError(f"Permission mode must be in range 0-777, got: {mode_int:o}")
+    if not 0 <= mode_int <= 0o777:
+        raise ValidationError(
+            "Permission mode must be in range 0-777, got: {mode:o}", mode=mode_int
+        )
 
     return True
 
@@ -564,13 +706,18 @@ def validate_regex(pattern: str) -> Pattern[str]:
     Raises:
         ValidationError: If pattern is invalid
     """
+    if not isinstance(pattern, str):
+        raise ValidationError(
+            "Regex pattern must be string, got {value_type}", value_type=type(pattern)
+        )
+
     if not pattern:
         raise ValidationError("Regex pattern cannot be empty")
 
     try:
-        return re.compile(pattern)
+        return _compile_cached(pattern)
     except re.error as e:
-        raise ValidationError(f"Failed to compile regex pattern: {e}")
+        raise ValidationError("Failed to compile regex pattern: {cause}", cause=e)
 
 
 def validate_glob(pattern: str) -> bool:
@@ -585,31 +732,38 @@ def validate_glob(pattern: str) -> bool:
     Raises:
         ValidationError: If pattern is invalid
     """
+    if not isinstance(pattern, str):
+        raise ValidationError(
+            "Glob pattern must be string, got {value_type}", value_type=type(pattern)
+        )
+
     if not pattern:
         raise ValidationError("Glob pattern cannot be empty")
 
     # Check length
     if len(pattern) > Limits.MAX_PATH_LENGTH:
-        raise ValidationError(f"Glob pattern exceeds maximum length ({Limits.MAX_PATH_LENGTH})")
-
-    # Check for null bytes
-    if "\0" in pattern:
-        raise ValidationError("Invalid glob pattern: contains null bytes")
-
-    # Check for control characters
-    if any(ord(c) < 32 and c not in "\t\n\r" for c in pattern):
-        raise ValidationError("Invalid glob pattern: contains control characters")
-
-    # Check for invalid glob characters in inappropriate positions
-    if pattern.startswith("/") and "**" in pattern:
-        parts = pattern.split("/")
-        for i, part in enumerate(parts):
-            if part == "**" and i not in (0, len(parts) - 1):
-                # ** must be alone in its path segment
-                if i > 0 and parts[i - 1] != "" and i < len(parts) - 1 and parts[i + 1] != "":
-                    pass  # This is valid
-            elif "**" in part and part != "**":
-                raise ValidationError(f"'**' must be alone in path segment: {part}")
+        raise ValidationError(
+            "Glob pattern exceeds maximum length ({limit})", limit=Limits.MAX_PATH_LENGTH
+        )
+
+    # Printable strings contain neither null bytes nor control characters
+    if not pattern.isprintable():
+        if "\0" in pattern:
+            raise ValidationError("Invalid glob pattern: contains null bytes")
+        if _CONTROL_CHARS_RE.search(pattern):
+            raise ValidationError("Invalid glob pattern: contains control characters")
+
+    # In absolute patterns, every "**" must fill its path segment on its own
+    if pattern.startswith("/"):
+        index = pattern.find("**")
+        while index >= 0:
+            end = index + 2
+            if pattern[index - 1] != "/" or (end < len(pattern) and pattern[end] != "/"):
+                start = pattern.rfind("/", 0, index) + 1
+                stop = pattern.find("/", end)
+                part = pattern[start:] if stop < 0 else pattern[start:stop]
+                raise ValidationError("'**' must be alone in path segment: {part}", part=part)
+            index = pattern.find("**", end)
 
     return True
 
@@ -626,13 +780,17 @@ def validate_timeout(timeout: Union[int, float]) -> bool:
     Raises:
         ValidationError: If timeout is invalid
     """
-    if not isinstance(timeout, (int, float)):
-        raise ValidationError(f"Timeout must be numeric, got {type(timeout)}")
+    if type(timeout) is not int and not isinstance(timeout, (int, float)):
+        raise ValidationError("Timeout must be numeric, got {value_type}", value_type=type(timeout))
 
     if timeout <= 0:
-        raise ValidationError(f"Timeout must be positive: {timeout}")
+        raise ValidationError("Timeout must be positive: {timeout}", timeout=timeout)
 
     if timeout > Limits.MAX_TIMEOUT:
-        raise ValidationError(f"Timeout exceeds maximum ({Limits.MAX_TIMEOUT} seconds): {timeout}")
+        raise ValidationError(
+            "Timeout exceeds maximum ({limit} seconds): {timeout}",
+            limit=Limits.MAX_TIMEOUT,
+            timeout=timeout,
+        )
 
     return True
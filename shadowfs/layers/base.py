@@ -71,13 +71,22 @@ class FileInfo:
         # Extract filename
         name = os.path.basename(real_path)
 
+        abs_path = os.path.abspath(real_path)
+
         # Compute relative path
         if source_root:
-            try:
-                path = os.path.relpath(real_path, source_root)
-            except ValueError:
-                # On Windows, relpath fails if paths are on different drives
-                path = real_path
+            # Files under the root only need the prefix stripped; relpath()
+            # re-normalises both paths on every call.
+            root = os.path.abspath(source_root)
+            prefix = root if root.endswith(os.sep) else root + os.sep
+            if abs_path.startswith(prefix):
+                path = abs_path[len(prefix) :]
+            else:
+                try:
+                    path = os.path.relpath(real_path, source_root)
+                except ValueError:
+                    # On Windows, relpath fails if paths are on different drives
+                    path = real_path
         else:
             # If no source root, just use the filename
             path = name
@@ -88,7 +97,7 @@ class FileInfo:
         return cls(
             name=name,
             path=path,
-            real_path=os.path.abspath(real_path),
+            real_path=abs_path,
             extension=extension,
             size=file_stat.st_size,
             mtime=file_stat.st_mtime,
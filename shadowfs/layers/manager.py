@@ -140,17 +140,17 @@ class LayerManager:
         self.files = []
 
         for source_path in self.sources:
-            source_root = Path(source_path).resolve()
+            # Plain strings throughout: building Path objects per entry costs
+            # more than the stat() itself on large trees.
+            source_root = os.path.realpath(source_path)
 
             # Walk directory tree
             for dirpath, dirnames, filenames in os.walk(source_root):
-                current_dir = Path(dirpath)
-
                 # Add regular files
                 for filename in filenames:
-                    file_path = current_dir / filename
+                    file_path = os.path.join(dirpath, filename)
                     try:
-                        file_info = FileInfo.from_path(str(file_path), str(source_root))
+                        file_info = FileInfo.from_path(file_path, source_root)
                         self.files.append(file_info)
                     except (OSError, PermissionError):
                         # Skip files we can't read
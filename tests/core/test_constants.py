@@ -36,36 +36,6 @@ class TestErrorCodes:
         for code in ErrorCode:
             assert 0 <= code.value <= 9
 
-    def test_all_required_codes_present(self):
-        """All required error codes must be defined."""
-        required = [
-            "SUCCESS",
-            "INVALID_INPUT",
-            "NOT_FOUND",
-            "PERMISSION_DENIED",
-            "CONFLICT",
-            "DEPENDENCY_ERROR",
-            "INTERNAL_ERROR",
-            "TIMEOUT",
-            "RATE_LIMITED",
-            "DEGRADED",
-        ]
-        actual = [e.name for e in ErrorCode]
-        assert set(required) == set(actual)
-
-    def test_error_code_values(self):
-        """Test specific error code values."""
-        assert ErrorCode.SUCCESS == 0
-        assert ErrorCode.INVALID_INPUT == 1
-        assert ErrorCode.NOT_FOUND == 2
-        assert ErrorCode.PERMISSION_DENIED == 3
-        assert ErrorCode.CONFLICT == 4
-        assert ErrorCode.DEPENDENCY_ERROR == 5
-        assert ErrorCode.INTERNAL_ERROR == 6
-        assert ErrorCode.TIMEOUT == 7
-        assert ErrorCode.RATE_LIMITED == 8
-        assert ErrorCode.DEGRADED == 9
-
 
 class TestFileAttributes:
     """Test file attributes structure."""
@@ -109,8 +79,26 @@ class TestFileAttributes:
             st_ctime=1.0,
         )
 
-        with pytest.raises(AttributeError):
-            attrs.st_size = 200
+        excinfo = pytest.raises(AttributeError, setattr, attrs, "st_size", 200)
+        excinfo.match(r"cannot assign|can't set|frozen|immutable")
+
+    def test_file_attributes_slots(self):
+        """FileAttributes should not carry a per-instance __dict__."""
+        attrs = FileAttributes(
+            st_mode=stat.S_IFREG | 0o644,
+            st_ino=1,
+            st_dev=1,
+            st_nlink=1,
+            st_uid=1000,
+            st_gid=1000,
+            st_size=100,
+            st_atime=1.0,
+            st_mtime=1.0,
+            st_ctime=1.0,
+        )
+
+        assert not hasattr(attrs, "__dict__")
+        assert "st_size" in FileAttributes.__slots__
 
     def test_directory_detection(self):
         """Test directory type detection."""
@@ -202,21 +190,6 @@ class TestLimits:
 class TestFileType:
     """Test file type enumeration."""
 
-    def test_all_types_defined(self):
-        """All standard file types must be defined."""
-        expected_types = [
-            "REGULAR",
-            "DIRECTORY",
-            "SYMLINK",
-            "BLOCK_DEVICE",
-            "CHARACTER_DEVICE",
-            "FIFO",
-            "SOCKET",
-            "UNKNOWN",
-        ]
-        actual_types = [t.name for t in FileType]
-        assert set(expected_types) == set(actual_types)
-
     def test_from_mode_regular_file(self):
         """Test file type detection for regular files."""
         mode = stat.S_IFREG | 0o644
@@ -264,62 +237,66 @@ class TestFileType:
         file_type = FileType.from_mode(0)
         assert file_type == FileType.UNKNOWN
 
-    def test_file_type_values(self):
-        """Test file type enum values."""
-        assert FileType.REGULAR.value == "regular"
-        assert FileType.DIRECTORY.value == "directory"
-        assert FileType.SYMLINK.value == "symlink"
-        assert FileType.BLOCK_DEVICE.value == "block"
-        assert FileType.CHARACTER_DEVICE.value == "char"
-        assert FileType.FIFO.value == "fifo"
-        assert FileType.SOCKET.value == "socket"
-        assert FileType.UNKNOWN.value == "unknown"
+
+ENUM_CONTRACT = {
+    ErrorCode: {
+        "SUCCESS": 0,
+        "INVALID_INPUT": 1,
+        "NOT_FOUND": 2,
+        "PERMISSION_DENIED": 3,
+        "CONFLICT": 4,
+        "DEPENDENCY_ERROR": 5,
+        "INTERNAL_ERROR": 6,
+        "TIMEOUT": 7,
+        "RATE_LIMITED": 8,
+        "DEGRADED": 9,
+    },
+    FileType: {
+        "REGULAR": "regular",
+        "DIRECTORY": "directory",
+        "SYMLINK": "symlink",
+        "BLOCK_DEVICE": "block",
+        "CHARACTER_DEVICE": "char",
+        "FIFO": "fifo",
+        "SOCKET": "socket",
+        "UNKNOWN": "unknown",
+    },
+    RuleType: {
+        "INCLUDE": "include",
+        "EXCLUDE": "exclude",
+        "TRANSFORM": "transform",
+    },
+    TransformType: {
+        "TEMPLATE": "template",
+        "COMPRESS": "compress",
+        "DECOMPRESS": "decompress",
+        "ENCRYPT": "encrypt",
+        "DECRYPT": "decrypt",
+        "CONVERT": "convert",
+    },
+    LayerType: {
+        "CLASSIFIER": "classifier",
+        "TAG": "tag",
+        "DATE": "date",
+        "HIERARCHICAL": "hierarchical",
+        "PATTERN": "pattern",
+        "COMPUTED": "computed",
+    },
+}
 
 
 class TestEnumerations:
-    """Test other enumerations."""
-
-    def test_rule_types(self):
-        """Test rule type enumeration."""
-        assert RuleType.INCLUDE.value == "include"
-        assert RuleType.EXCLUDE.value == "exclude"
-        assert RuleType.TRANSFORM.value == "transform"
-
-    def test_rule_types_complete(self):
-        """All rule types defined."""
-        expected = ["INCLUDE", "EXCLUDE", "TRANSFORM"]
-        actual = [t.name for t in RuleType]
-        assert set(expected) == set(actual)
-
-    def test_transform_types(self):
-        """Test transform type enumeration."""
-        expected = ["TEMPLATE", "COMPRESS", "DECOMPRESS", "ENCRYPT", "DECRYPT", "CONVERT"]
-        actual = [t.name for t in TransformType]
-        assert set(expected) == set(actual)
-
-    def test_transform_type_values(self):
-        """Test transform type values."""
-        assert TransformType.TEMPLATE.value == "template"
-        assert TransformType.COMPRESS.value == "compress"
-        assert TransformType.DECOMPRESS.value == "decompress"
-        assert TransformType.ENCRYPT.value == "encrypt"
-        assert TransformType.DECRYPT.value == "decrypt"
-        assert TransformType.CONVERT.value == "convert"
-
-    def test_virtual_layer_types(self):
-        """Test virtual layer type enumeration."""
-        expected = ["CLASSIFIER", "TAG", "DATE", "HIERARCHICAL", "PATTERN", "COMPUTED"]
-        actual = [t.name for t in LayerType]
-        assert set(expected) == set(actual)
-
-    def test_virtual_layer_type_values(self):
-        """Test virtual layer type values."""
-        assert LayerType.CLASSIFIER.value == "classifier"
-        assert LayerType.TAG.value == "tag"
-        assert LayerType.DATE.value == "date"
-        assert LayerType.HIERARCHICAL.value == "hierarchical"
-        assert LayerType.PATTERN.value == "pattern"
-        assert LayerType.COMPUTED.value == "computed"
+    """Test enumeration members and values."""
+
+    @pytest.mark.parametrize(
+        "enum_cls,expected",
+        list(ENUM_CONTRACT.items()),
+        ids=[cls.__name__ for cls in ENUM_CONTRACT],
+    )
+    def test_enum_contract(self, enum_cls, expected):
+        """Each enum defines exactly the expected names and values."""
+        actual = {member.name: member.value for member in enum_cls}
+        assert actual == expected
 
 
 class TestConfigKeys:
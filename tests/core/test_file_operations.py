@@ -1,18 +1,24 @@
 """Tests for file operations module."""
+import errno
 import hashlib
 import os
 import shutil
 import stat
+import sys
 import tempfile
+import threading
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from unittest.mock import ANY, MagicMock, mock_open, patch
+from unittest.mock import ANY, mock_open, patch
 
 import pytest
 
+from shadowfs.core import file_ops
 from shadowfs.core.constants import ErrorCode, FileAttributes, Limits
 from shadowfs.core.file_ops import (
     FileOperationError,
     calculate_checksum,
+    calculate_checksums,
     copy_file,
     create_directory,
     create_symlink,
@@ -27,10 +33,28 @@ from shadowfs.core.file_ops import (
     open_file,
     read_file,
     set_permissions,
+    set_permissions_recursive,
     write_file,
 )
 
 
+def open_fds():
+    """Return the file descriptors currently open in this process."""
+    fd_dir = "/proc/self/fd" if os.path.isdir("/proc/self/fd") else "/dev/fd"
+    return set(os.listdir(fd_dir))
+
+
+@contextmanager
+def chmod_temporarily(path, mode):
+    """Set path's permission bits for the duration of the block, then restore them."""
+    original = stat.S_IMODE(os.stat(path).st_mode)
+    os.chmod(path, mode)
+    try:
+        yield
+    finally:
+        os.chmod(path, original)
+
+
 class TestFileOperationError:
     """Test FileOperationError exception."""
 
@@ -89,6 +113,25 @@ class TestReadFile:
         finally:
             os.unlink(tmp_path)
 
+    def test_read_large_binary_file(self):
+        """Test a binary read sized from fstat returns the whole file."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            content = os.urandom(1024 * 1024 + 7)
+            tmp.write(content)
+            tmp_path = tmp.name
+
+        try:
+            assert read_file(tmp_path, binary=True) == content
+        finally:
+            os.unlink(tmp_path)
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="requires procfs")
+    def test_read_pseudo_file(self):
+        """Test reading a file that reports size 0 but has content."""
+        content = read_file("/proc/self/status", binary=True)
+        assert os.stat("/proc/self/status").st_size == 0
+        assert b"Name:" in content
+
     def test_read_exceeds_size_limit(self):
         """Test reading file that exceeds size limit."""
         with tempfile.NamedTemporaryFile(delete=False) as tmp:
@@ -116,12 +159,11 @@ class TestReadFile:
             tmp_path = tmp.name
 
         try:
-            os.chmod(tmp_path, 0o000)
-            with pytest.raises(FileOperationError) as exc_info:
-                read_file(tmp_path)
+            with chmod_temporarily(tmp_path, 0o000):
+                with pytest.raises(FileOperationError) as exc_info:
+                    read_file(tmp_path)
             assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
         finally:
-            os.chmod(tmp_path, 0o644)
             os.unlink(tmp_path)
 
     def test_read_io_error(self):
@@ -178,6 +220,117 @@ class TestWriteFile:
             with open(file_path, "r") as f:
                 assert f.read() == "new content"
 
+    def test_write_atomic_leaves_no_temp_files(self):
+        """Test atomic writes leave only the target file in the directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.txt")
+            write_file(file_path, b"one", atomic=True)
+            write_file(file_path, b"two", atomic=True)
+
+            assert os.listdir(tmpdir) == ["test.txt"]
+            with open(file_path, "rb") as f:
+                assert f.read() == b"two"
+
+    def test_write_atomic_without_tmpfile(self):
+        """Test atomic write falls back to a named temp file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.txt")
+            with patch("shadowfs.core.file_ops._O_TMPFILE", 0):
+                write_file(file_path, "initial", binary=False, atomic=True)
+                write_file(file_path, "replaced", binary=False, atomic=True)
+
+            assert os.listdir(tmpdir) == ["test.txt"]
+            with open(file_path, "r") as f:
+                assert f.read() == "replaced"
+
+    def test_write_atomic_tmpfile_unsupported(self):
+        """Test atomic write falls back when the filesystem rejects O_TMPFILE."""
+        real_open = os.open
+
+        def no_tmpfile(path, flags, *args, **kwargs):
+            if flags & file_ops._O_TMPFILE:
+                raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+            return real_open(path, flags, *args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.txt")
+            with patch("shadowfs.core.file_ops._O_TMPFILE", os.O_TMPFILE), patch(
+                "shadowfs.core.file_ops.os.open", side_effect=no_tmpfile
+            ):
+                write_file(file_path, b"content", atomic=True)
+
+            with open(file_path, "rb") as f:
+                assert f.read() == b"content"
+
+    def test_write_atomic_failure_keeps_original(self):
+        """Test a failed atomic write leaves the original file and no temp files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.txt")
+            write_file(file_path, "original", binary=False)
+
+            failure = OSError(errno.EIO, "I/O error")
+            with patch("shadowfs.core.file_ops.os.link", side_effect=failure):
+                with pytest.raises(FileOperationError):
+                    write_file(file_path, "new", binary=False, atomic=True)
+            with patch("shadowfs.core.file_ops._O_TMPFILE", 0), patch(
+                "shadowfs.core.file_ops.os.replace", side_effect=failure
+            ):
+                with pytest.raises(FileOperationError):
+                    write_file(file_path, "new", binary=False, atomic=True)
+
+            assert os.listdir(tmpdir) == ["test.txt"]
+            with open(file_path, "r") as f:
+                assert f.read() == "original"
+
+    @pytest.mark.parametrize("tmpfile", [True, False])
+    def test_write_atomic_file_mode(self, tmpfile):
+        """Test atomic writes give the same owner-only mode with and without O_TMPFILE."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.txt")
+            write_file(file_path, b"original", atomic=False)
+            os.chmod(file_path, 0o640)
+
+            with patch("shadowfs.core.file_ops._O_TMPFILE", file_ops._O_TMPFILE if tmpfile else 0):
+                write_file(file_path, b"new", atomic=True)
+
+            assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o600
+
+    def test_write_atomic_replace_failure_removes_link(self):
+        """Test a failed rename over an existing file removes the temporary link."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.txt")
+            write_file(file_path, "original", binary=False)
+
+            with patch(
+                "shadowfs.core.file_ops.os.replace", side_effect=OSError(errno.EIO, "I/O error")
+            ):
+                with pytest.raises(FileOperationError) as exc_info:
+                    write_file(file_path, "new", binary=False, atomic=True)
+            assert "I/O error" in str(exc_info.value)
+
+            assert os.listdir(tmpdir) == ["test.txt"]
+            with open(file_path, "r") as f:
+                assert f.read() == "original"
+
+    def test_write_atomic_cleanup_failure_keeps_original_error(self):
+        """Test an unremovable temporary file does not mask the write error."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.txt")
+            write_file(file_path, "original", binary=False)
+
+            with patch(
+                "shadowfs.core.file_ops.os.replace", side_effect=OSError(errno.EIO, "I/O error")
+            ), patch(
+                "shadowfs.core.file_ops.os.unlink",
+                side_effect=OSError(errno.EBUSY, "Device busy"),
+            ):
+                with pytest.raises(FileOperationError) as exc_info:
+                    write_file(file_path, "new", binary=False, atomic=True)
+            assert "I/O error" in str(exc_info.value)
+
+            with open(file_path, "r") as f:
+                assert f.read() == "original"
+
     def test_write_non_atomic(self):
         """Test non-atomic direct write."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -200,15 +353,12 @@ class TestWriteFile:
     def test_write_permission_denied(self):
         """Test write with permission denied."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            os.chmod(tmpdir, 0o444)  # Read-only
             file_path = os.path.join(tmpdir, "test.txt")
 
-            try:
+            with chmod_temporarily(tmpdir, 0o444):  # Read-only
                 with pytest.raises(FileOperationError) as exc_info:
                     write_file(file_path, "content", binary=False)
-                assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
-            finally:
-                os.chmod(tmpdir, 0o755)
+            assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
 
     def test_write_io_error(self):
         """Test write with IO error."""
@@ -282,13 +432,10 @@ class TestDeleteFile:
             with open(file_path, "w") as f:
                 f.write("content")
 
-            os.chmod(tmpdir, 0o444)  # Read-only directory
-            try:
+            with chmod_temporarily(tmpdir, 0o444):  # Read-only directory
                 with pytest.raises(FileOperationError) as exc_info:
                     delete_file(file_path)
-                assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
-            finally:
-                os.chmod(tmpdir, 0o755)
+            assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
 
     def test_delete_io_error(self):
         """Test delete with IO error."""
@@ -375,6 +522,36 @@ class TestCopyFile:
             with open(dest, "r") as f:
                 assert f.read() == "source content"
 
+    def test_copy_overwrite_false_onto_directory(self):
+        """Test copy without overwrite refuses an existing directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            with open(source, "w") as f:
+                f.write("content")
+            os.mkdir(os.path.join(tmpdir, "target"))
+
+            with pytest.raises(FileOperationError) as exc_info:
+                copy_file(source, os.path.join(tmpdir, "target"))
+            assert exc_info.value.error_code == ErrorCode.CONFLICT
+            assert os.listdir(os.path.join(tmpdir, "target")) == []
+
+    def test_copy_failure_removes_new_destination(self):
+        """Test a failed copy does not leave a partial new destination."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            dest = os.path.join(tmpdir, "dest.txt")
+            with open(source, "w") as f:
+                f.write("content")
+
+            with patch(
+                "shadowfs.core.file_ops.os.copy_file_range",
+                side_effect=OSError(errno.EIO, "I/O error"),
+            ):
+                with pytest.raises(FileOperationError) as exc_info:
+                    copy_file(source, dest)
+            assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
+            assert not os.path.exists(dest)
+
     def test_copy_source_not_found(self):
         """Test copy with non-existent source."""
         with pytest.raises(FileOperationError) as exc_info:
@@ -384,19 +561,153 @@ class TestCopyFile:
     def test_copy_permission_denied(self):
         """Test copy with permission denied."""
         with tempfile.NamedTemporaryFile() as tmp:
-            with patch("shutil.copy2", side_effect=PermissionError("Permission denied")):
+            with patch(
+                "shadowfs.core.file_ops._copy_data",
+                side_effect=PermissionError("Permission denied"),
+            ):
                 with pytest.raises(FileOperationError) as exc_info:
                     copy_file(tmp.name, "/dest.txt")
                 assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
 
     def test_copy_shutil_error(self):
         """Test copy with shutil error."""
-        with patch("shutil.copy2", side_effect=shutil.Error("Shutil error")):
+        with patch("shadowfs.core.file_ops._copy_data", side_effect=shutil.Error("Shutil error")):
             with tempfile.NamedTemporaryFile() as tmp:
                 with pytest.raises(FileOperationError) as exc_info:
                     copy_file(tmp.name, "/dest.txt")
                 assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
 
+    def test_copy_large_file(self):
+        """Test copying a file that takes several copy_file_range calls."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.bin")
+            dest = os.path.join(tmpdir, "dest.bin")
+            content = os.urandom(3 * 1024 * 1024 + 17)
+            with open(source, "wb") as f:
+                f.write(content)
+
+            # Cap each kernel copy at 1 MiB so the copy loop runs several times
+            copy_file_range = os.copy_file_range
+            with patch(
+                "shadowfs.core.file_ops.os.copy_file_range",
+                side_effect=lambda src, dst, count: copy_file_range(src, dst, min(count, 1 << 20)),
+            ) as mock_copy:
+                copy_file(source, dest)
+            assert mock_copy.call_count == 5
+
+            with open(dest, "rb") as f:
+                assert f.read() == content
+
+    def test_copy_file_range_unsupported(self):
+        """Test copy falls back to sendfile when copy_file_range is unsupported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            dest = os.path.join(tmpdir, "dest.txt")
+            with open(source, "w") as f:
+                f.write("source content")
+            with open(dest, "w") as f:
+                f.write("much longer dest content")
+
+            sendfile = os.sendfile
+            with patch(
+                "shadowfs.core.file_ops.os.copy_file_range",
+                side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+                create=True,
+            ), patch("shadowfs.core.file_ops.os.sendfile", side_effect=sendfile) as mock_sendfile:
+                copy_file(source, dest, overwrite=True)
+            assert mock_sendfile.called
+
+            with open(dest, "r") as f:
+                assert f.read() == "source content"
+
+    def test_copy_sendfile_unsupported(self):
+        """Test copy falls back to a buffered copy when no kernel copy applies."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            dest = os.path.join(tmpdir, "dest.txt")
+            with open(source, "w") as f:
+                f.write("source content")
+
+            with patch("shadowfs.core.file_ops._COPY_FILE_RANGE", False), patch(
+                "shadowfs.core.file_ops.os.sendfile",
+                side_effect=OSError(errno.EINVAL, "Invalid argument"),
+            ), patch(
+                "shadowfs.core.file_ops.shutil.copyfileobj", side_effect=shutil.copyfileobj
+            ) as mock_copyfileobj:
+                copy_file(source, dest)
+            assert mock_copyfileobj.call_args[0][2] == file_ops.COPY_BUFFER_SIZE
+
+            with open(dest, "r") as f:
+                assert f.read() == "source content"
+
+    def test_copy_sendfile_failure_after_partial_copy(self):
+        """Test a sendfile error after data was written is not retried."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.bin")
+            dest = os.path.join(tmpdir, "dest.bin")
+            with open(source, "wb") as f:
+                f.write(b"x" * 4096)
+
+            calls = iter([1024, OSError(errno.EINVAL, "Invalid argument")])
+
+            def fake_sendfile(out_fd, in_fd, offset, count):
+                result = next(calls)
+                if isinstance(result, OSError):
+                    raise result
+                return result
+
+            with patch("shadowfs.core.file_ops._COPY_FILE_RANGE", False), patch(
+                "shadowfs.core.file_ops.os.sendfile", side_effect=fake_sendfile
+            ):
+                with pytest.raises(FileOperationError) as exc_info:
+                    copy_file(source, dest)
+            assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
+            assert not os.path.exists(dest)
+
+    def test_copy_without_copy_file_range(self):
+        """Test copy on platforms without copy_file_range."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            dest = os.path.join(tmpdir, "dest.txt")
+            with open(source, "w") as f:
+                f.write("content")
+
+            with patch("shadowfs.core.file_ops._COPY_FILE_RANGE", False), patch(
+                "shadowfs.core.file_ops._SENDFILE", False
+            ):
+                copy_file(source, dest)
+
+            with open(dest, "r") as f:
+                assert f.read() == "content"
+
+    def test_copy_onto_itself(self):
+        """Test copying a file onto itself fails without truncating it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            with open(source, "w") as f:
+                f.write("content")
+
+            with pytest.raises(FileOperationError) as exc_info:
+                copy_file(source, source, overwrite=True)
+            assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
+
+            with open(source, "r") as f:
+                assert f.read() == "content"
+
+    def test_copy_into_directory(self):
+        """Test copying into an existing directory keeps the source name."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            target_dir = os.path.join(tmpdir, "target")
+            os.mkdir(target_dir)
+            with open(source, "w") as f:
+                f.write("content")
+
+            copy_file(source, target_dir, overwrite=True)
+
+            with open(os.path.join(target_dir, "source.txt"), "r") as f:
+                assert f.read() == "content"
+
 
 class TestMoveFile:
     """Test move_file function."""
@@ -449,6 +760,24 @@ class TestMoveFile:
             with open(dest, "r") as f:
                 assert f.read() == "source content"
 
+    def test_move_overwrite_rename_error_propagates(self):
+        """Test rename errors other than the fallback ones are not retried."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            dest = os.path.join(tmpdir, "dest.txt")
+            with open(source, "w") as f:
+                f.write("source content")
+
+            with patch(
+                "shadowfs.core.file_ops.os.rename", side_effect=OSError(errno.EIO, "I/O error")
+            ), patch("shadowfs.core.file_ops.shutil.move") as mock_move:
+                with pytest.raises(FileOperationError) as exc_info:
+                    move_file(source, dest, overwrite=True)
+            assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
+            assert "I/O error" in str(exc_info.value)
+            mock_move.assert_not_called()
+            assert os.path.exists(source)
+
     def test_move_source_not_found(self):
         """Test move with non-existent source."""
         with pytest.raises(FileOperationError) as exc_info:
@@ -458,19 +787,159 @@ class TestMoveFile:
     def test_move_permission_denied(self):
         """Test move with permission denied."""
         with tempfile.NamedTemporaryFile() as tmp:
-            with patch("shutil.move", side_effect=PermissionError("Permission denied")):
+            with patch(
+                "shadowfs.core.file_ops.os.link", side_effect=PermissionError("Permission denied")
+            ):
                 with pytest.raises(FileOperationError) as exc_info:
                     move_file(tmp.name, "/dest.txt")
                 assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
 
     def test_move_shutil_error(self):
         """Test move with shutil error."""
-        with patch("shutil.move", side_effect=shutil.Error("Shutil error")):
+        with patch(
+            "shadowfs.core.file_ops.os.link",
+            side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+        ), patch("shutil.move", side_effect=shutil.Error("Shutil error")):
             with tempfile.NamedTemporaryFile() as tmp:
                 with pytest.raises(FileOperationError) as exc_info:
                     move_file(tmp.name, "/dest.txt")
                 assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
 
+    def test_move_overwrite_false_keeps_source_on_conflict(self):
+        """Test a conflicting move leaves both files untouched."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            dest = os.path.join(tmpdir, "dest.txt")
+            with open(source, "w") as f:
+                f.write("source content")
+            with open(dest, "w") as f:
+                f.write("dest content")
+
+            with pytest.raises(FileOperationError) as exc_info:
+                move_file(source, dest, overwrite=False)
+            assert exc_info.value.error_code == ErrorCode.CONFLICT
+
+            with open(source, "r") as f:
+                assert f.read() == "source content"
+            with open(dest, "r") as f:
+                assert f.read() == "dest content"
+
+    def test_move_directory(self):
+        """Test moving a directory, which cannot be hard-linked."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source")
+            os.mkdir(source)
+            with open(os.path.join(source, "file.txt"), "w") as f:
+                f.write("content")
+            dest = os.path.join(tmpdir, "dest")
+
+            move_file(source, dest)
+
+            assert not os.path.exists(source)
+            with open(os.path.join(dest, "file.txt"), "r") as f:
+                assert f.read() == "content"
+
+    def test_move_directory_conflict(self):
+        """Test moving a directory onto an existing path fails."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source")
+            dest = os.path.join(tmpdir, "dest")
+            os.mkdir(source)
+            os.mkdir(dest)
+
+            with pytest.raises(FileOperationError) as exc_info:
+                move_file(source, dest)
+            assert exc_info.value.error_code == ErrorCode.CONFLICT
+            assert os.path.isdir(source)
+
+    def test_move_cross_device_conflict(self):
+        """Test the non-link fallback still refuses to replace a destination."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            dest = os.path.join(tmpdir, "dest.txt")
+            for file_path in (source, dest):
+                with open(file_path, "w") as f:
+                    f.write("content")
+
+            with patch(
+                "shadowfs.core.file_ops.os.link",
+                side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+            ):
+                with pytest.raises(FileOperationError) as exc_info:
+                    move_file(source, dest)
+            assert exc_info.value.error_code == ErrorCode.CONFLICT
+            assert os.path.exists(source)
+
+    def test_move_into_directory_with_overwrite(self):
+        """Test overwrite=True onto a directory moves the file into it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            target_dir = os.path.join(tmpdir, "target")
+            os.mkdir(target_dir)
+            with open(source, "w") as f:
+                f.write("content")
+
+            move_file(source, target_dir, overwrite=True)
+
+            assert not os.path.exists(source)
+            with open(os.path.join(target_dir, "source.txt"), "r") as f:
+                assert f.read() == "content"
+
+    def test_move_directory_onto_empty_directory_with_overwrite(self):
+        """Test overwrite=True nests a directory inside an empty destination directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source")
+            os.makedirs(os.path.join(source, "sub"))
+            with open(os.path.join(source, "file.txt"), "w") as f:
+                f.write("content")
+            target_dir = os.path.join(tmpdir, "target")
+            os.mkdir(target_dir)
+
+            move_file(source, target_dir, overwrite=True)
+
+            assert not os.path.exists(source)
+            assert os.listdir(target_dir) == ["source"]
+            assert sorted(os.listdir(os.path.join(target_dir, "source"))) == ["file.txt", "sub"]
+
+    def test_move_overwrite_cross_device(self):
+        """Test overwrite=True copies across devices when rename cannot."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            dest = os.path.join(tmpdir, "dest.txt")
+            with open(source, "w") as f:
+                f.write("source content")
+            with open(dest, "w") as f:
+                f.write("dest content")
+
+            # shutil.move's own rename fails the same way and falls back to copying
+            with patch(
+                "shadowfs.core.file_ops.os.rename",
+                side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+            ):
+                move_file(source, dest, overwrite=True)
+
+            assert not os.path.exists(source)
+            with open(dest, "r") as f:
+                assert f.read() == "source content"
+
+    def test_move_unlink_failure_removes_new_link(self):
+        """Test a failed source unlink does not leave the file in both places."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, "source.txt")
+            dest = os.path.join(tmpdir, "dest.txt")
+            with open(source, "w") as f:
+                f.write("content")
+
+            with patch(
+                "shadowfs.core.file_ops.os.unlink",
+                side_effect=[OSError(errno.EIO, "I/O error"), None],
+            ) as mock_unlink:
+                with pytest.raises(FileOperationError):
+                    move_file(source, dest)
+                mock_unlink.assert_called_with(dest)
+
+            assert os.path.exists(source)
+
 
 class TestGetFileAttributes:
     """Test get_file_attributes function."""
@@ -573,10 +1042,8 @@ class TestFileChecks:
     def test_is_readable_false(self):
         """Test is_readable returns False for unreadable file."""
         with tempfile.NamedTemporaryFile() as tmp:
-            os.chmod(tmp.name, 0o000)
-            result = is_readable(tmp.name)
-            os.chmod(tmp.name, 0o644)  # Restore for cleanup
-            assert result is False
+            with chmod_temporarily(tmp.name, 0o000):
+                assert is_readable(tmp.name) is False
 
     def test_is_readable_nonexistent(self):
         """Test is_readable returns False for non-existent file."""
@@ -591,10 +1058,8 @@ class TestFileChecks:
     def test_is_writable_false(self):
         """Test is_writable returns False for read-only file."""
         with tempfile.NamedTemporaryFile() as tmp:
-            os.chmod(tmp.name, 0o444)
-            result = is_writable(tmp.name)
-            os.chmod(tmp.name, 0o644)  # Restore for cleanup
-            assert result is False
+            with chmod_temporarily(tmp.name, 0o444):
+                assert is_writable(tmp.name) is False
 
     def test_is_writable_nonexistent(self):
         """Test is_writable returns False for non-existent file."""
@@ -671,15 +1136,12 @@ class TestCreateDirectory:
     def test_create_permission_denied(self):
         """Test create with permission denied."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            os.chmod(tmpdir, 0o444)  # Read-only
             new_dir = os.path.join(tmpdir, "newdir")
 
-            try:
+            with chmod_temporarily(tmpdir, 0o444):  # Read-only
                 with pytest.raises(FileOperationError) as exc_info:
                     create_directory(new_dir)
-                assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
-            finally:
-                os.chmod(tmpdir, 0o755)
+            assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
 
     def test_create_io_error(self):
         """Test create with IO error."""
@@ -706,6 +1168,22 @@ class TestListDirectory:
             assert "file2.txt" in entries
             assert "subdir" in entries
 
+    def test_list_directory_no_stat_per_entry(self):
+        """Test listing does not stat the returned entries."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(10):
+                open(os.path.join(tmpdir, f"file{i}.txt"), "w").close()
+
+            with patch("os.stat", wraps=os.stat) as mock_stat, patch(
+                "os.lstat", wraps=os.lstat
+            ) as mock_lstat:
+                entries = list_directory(tmpdir)
+
+            assert len(entries) == 10
+            stat_calls = mock_stat.call_args_list + mock_lstat.call_args_list
+            stated = {os.path.basename(os.fspath(c.args[0])) for c in stat_calls}
+            assert stated.isdisjoint(entries)
+
     def test_list_directory_exclude_hidden(self):
         """Test listing directory excluding hidden files."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -752,13 +1230,10 @@ class TestListDirectory:
     def test_list_permission_denied(self):
         """Test listing directory with no permissions."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            os.chmod(tmpdir, 0o000)
-            try:
+            with chmod_temporarily(tmpdir, 0o000):
                 with pytest.raises(FileOperationError) as exc_info:
                     list_directory(tmpdir)
-                assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
-            finally:
-                os.chmod(tmpdir, 0o755)
+            assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
 
     def test_list_io_error(self):
         """Test listing with IO error."""
@@ -795,6 +1270,19 @@ class TestOpenFile:
             with open(file_path, "r") as f:
                 assert f.read() == "test content"
 
+    def test_open_file_copy_large_checksum(self):
+        """Test a file written through open_file copies with an identical checksum."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.bin")
+            copy_path = os.path.join(tmpdir, "copy.bin")
+
+            with open_file(file_path, "wb") as f:
+                f.write(os.urandom(2 * 1024 * 1024 + 5))
+
+            copy_file(file_path, copy_path)
+
+            assert calculate_checksum(copy_path) == calculate_checksum(file_path)
+
     def test_open_file_read_binary(self):
         """Test opening file for reading binary."""
         with tempfile.NamedTemporaryFile(delete=False) as tmp:
@@ -834,13 +1322,12 @@ class TestOpenFile:
             tmp_path = tmp.name
 
         try:
-            os.chmod(tmp_path, 0o000)
-            with pytest.raises(FileOperationError) as exc_info:
-                with open_file(tmp_path, "r") as f:
-                    pass
+            with chmod_temporarily(tmp_path, 0o000):
+                with pytest.raises(FileOperationError) as exc_info:
+                    with open_file(tmp_path, "r") as f:
+                        pass
             assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
         finally:
-            os.chmod(tmp_path, 0o644)
             os.unlink(tmp_path)
 
     def test_open_file_io_error(self):
@@ -853,14 +1340,17 @@ class TestOpenFile:
 
     def test_open_file_closes_on_error(self):
         """Test file is closed even on error."""
-        mock_file = MagicMock()
-        with patch("builtins.open", return_value=mock_file):
-            try:
-                with open_file("/some/file.txt", "r") as f:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.txt")
+            with open(file_path, "w") as f:
+                f.write("content")
+
+            before = open_fds()
+            with pytest.raises(RuntimeError):
+                with open_file(file_path, "r") as f:
                     raise RuntimeError("Test error")
-            except RuntimeError:
-                pass
-            mock_file.close.assert_called_once()
+            assert f.closed
+            assert open_fds() - before == set()
 
 
 class TestCalculateChecksum:
@@ -920,6 +1410,78 @@ class TestCalculateChecksum:
         finally:
             os.unlink(tmp_path)
 
+    def test_checksum_partial_final_chunk(self):
+        """Test the reused buffer only hashes the bytes read into it."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            content = os.urandom(3 * 4096 + 123)
+            tmp.write(content)
+            tmp_path = tmp.name
+
+        try:
+            for algorithm in ("sha256", "md5", "blake2b", "sha3_256"):
+                checksum = calculate_checksum(tmp_path, algorithm=algorithm, chunk_size=4096)
+                assert checksum == hashlib.new(algorithm, content).hexdigest()
+        finally:
+            os.unlink(tmp_path)
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="requires posix_fadvise")
+    def test_checksum_advises_sequential_read(self):
+        """Test checksum hints a sequential read and tolerates the hint failing."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            tmp.write(b"content")
+            tmp_path = tmp.name
+
+        try:
+            with patch("shadowfs.core.file_ops.os.posix_fadvise") as mock_fadvise:
+                calculate_checksum(tmp_path)
+            mock_fadvise.assert_called_once_with(ANY, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            with patch(
+                "shadowfs.core.file_ops.os.posix_fadvise",
+                side_effect=OSError(errno.ESPIPE, "Illegal seek"),
+            ):
+                checksum = calculate_checksum(tmp_path)
+            assert checksum == hashlib.sha256(b"content").hexdigest()
+        finally:
+            os.unlink(tmp_path)
+
+    def test_checksum_without_fadvise(self, monkeypatch):
+        """Test checksum on platforms without posix_fadvise."""
+        monkeypatch.setattr(file_ops, "_POSIX_FADVISE", False)
+        monkeypatch.delattr(os, "posix_fadvise", raising=False)
+        with tempfile.NamedTemporaryFile() as tmp:
+            tmp.write(b"content")
+            tmp.flush()
+
+            assert calculate_checksum(tmp.name) == hashlib.sha256(b"content").hexdigest()
+
+    def test_checksum_reuses_buffer_per_thread(self):
+        """Test default-size buffers are reused within a thread only."""
+        first = file_ops._checksum_buffer(file_ops.CHECKSUM_CHUNK_SIZE)
+        assert file_ops._checksum_buffer(file_ops.CHECKSUM_CHUNK_SIZE) is first
+        assert file_ops._checksum_buffer(4096)[0] is not first[0]
+
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(file_ops._checksum_buffer(file_ops.CHECKSUM_CHUNK_SIZE))
+        )
+        thread.start()
+        thread.join()
+        assert other[0][0] is not first[0]
+
+    def test_checksum_reused_buffer_stale_bytes(self):
+        """Test a reused buffer does not leak bytes from a previous, larger file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            big = os.path.join(tmpdir, "big.bin")
+            small = os.path.join(tmpdir, "small.bin")
+            with open(big, "wb") as f:
+                f.write(os.urandom(file_ops.CHECKSUM_CHUNK_SIZE))
+            with open(small, "wb") as f:
+                f.write(b"small")
+
+            calculate_checksum(big)
+            assert calculate_checksum(small) == hashlib.sha256(b"small").hexdigest()
+
     def test_checksum_invalid_algorithm(self):
         """Test checksum with invalid algorithm."""
         with tempfile.NamedTemporaryFile() as tmp:
@@ -939,12 +1501,11 @@ class TestCalculateChecksum:
             tmp_path = tmp.name
 
         try:
-            os.chmod(tmp_path, 0o000)
-            with pytest.raises(FileOperationError) as exc_info:
-                calculate_checksum(tmp_path)
+            with chmod_temporarily(tmp_path, 0o000):
+                with pytest.raises(FileOperationError) as exc_info:
+                    calculate_checksum(tmp_path)
             assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
         finally:
-            os.chmod(tmp_path, 0o644)
             os.unlink(tmp_path)
 
     def test_checksum_io_error(self):
@@ -955,6 +1516,59 @@ class TestCalculateChecksum:
             assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
 
 
+class TestCalculateChecksums:
+    """Test calculate_checksums function."""
+
+    def test_checksums_many_files(self):
+        """Test batch checksums match per-file digests."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            contents = {}
+            for i in range(20):
+                file_path = os.path.join(tmpdir, f"file{i}.bin")
+                contents[file_path] = os.urandom(i * 100)
+                with open(file_path, "wb") as f:
+                    f.write(contents[file_path])
+
+            checksums = calculate_checksums(list(contents), max_workers=4)
+
+            assert list(checksums) == list(contents)
+            for file_path, content in contents.items():
+                assert checksums[file_path] == hashlib.sha256(content).hexdigest()
+
+    def test_checksums_single_and_empty(self):
+        """Test batch checksums for zero and one path."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            tmp.write(b"content")
+            tmp_path = tmp.name
+
+        try:
+            assert calculate_checksums([]) == {}
+            assert calculate_checksums([tmp_path], algorithm="md5") == {
+                tmp_path: hashlib.md5(b"content").hexdigest()
+            }
+        finally:
+            os.unlink(tmp_path)
+
+    def test_checksums_invalid_algorithm(self):
+        """Test batch checksums reject an unknown algorithm before reading files."""
+        with patch("shadowfs.core.file_ops.calculate_checksum") as mock_checksum:
+            with pytest.raises(FileOperationError) as exc_info:
+                calculate_checksums(["/a", "/b"], algorithm="invalid_algo")
+        assert exc_info.value.error_code == ErrorCode.INVALID_INPUT
+        mock_checksum.assert_not_called()
+
+    def test_checksums_missing_file(self):
+        """Test batch checksums propagate a per-file failure."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "exists.txt")
+            with open(file_path, "wb") as f:
+                f.write(b"content")
+
+            with pytest.raises(FileOperationError) as exc_info:
+                calculate_checksums([file_path, os.path.join(tmpdir, "missing.txt")])
+            assert exc_info.value.error_code == ErrorCode.NOT_FOUND
+
+
 class TestSetPermissions:
     """Test set_permissions function."""
 
@@ -1003,6 +1617,209 @@ class TestSetPermissions:
             assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
 
 
+class TestSetPermissionsRecursive:
+    """Test set_permissions_recursive function."""
+
+    def _make_tree(self, root):
+        """Create files and nested directories under root."""
+        os.makedirs(os.path.join(root, "a", "b"))
+        for name in ("top.txt", os.path.join("a", "mid.txt"), os.path.join("a", "b", "low.txt")):
+            with open(os.path.join(root, name), "w") as f:
+                f.write("content")
+
+    @pytest.mark.parametrize("o_path", [True, False])
+    def test_set_permissions_recursive_tree(self, o_path):
+        """Test files and directories get their own modes, with or without O_PATH."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._make_tree(tmpdir)
+
+            with patch("shadowfs.core.file_ops._O_PATH", file_ops._O_PATH if o_path else 0):
+                set_permissions_recursive(tmpdir, 0o600, dir_mode=0o700)
+
+            for dirpath, dirnames, filenames in os.walk(tmpdir):
+                assert stat.S_IMODE(os.stat(dirpath).st_mode) == 0o700
+                for name in filenames:
+                    assert stat.S_IMODE(os.stat(os.path.join(dirpath, name)).st_mode) == 0o600
+
+    def test_set_permissions_recursive_default_dir_mode(self):
+        """Test directories use mode when dir_mode is not given."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._make_tree(tmpdir)
+
+            set_permissions_recursive(tmpdir, 0o750)
+
+            assert stat.S_IMODE(os.stat(os.path.join(tmpdir, "a", "b")).st_mode) == 0o750
+            assert stat.S_IMODE(os.stat(os.path.join(tmpdir, "top.txt")).st_mode) == 0o750
+
+    def test_set_permissions_recursive_unsearchable_dir_mode(self):
+        """Test a dir_mode without search permission still reaches nested files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = os.path.join(tmpdir, "root")
+            os.mkdir(root)
+            self._make_tree(root)
+
+            set_permissions_recursive(root, 0o640, dir_mode=0o600)
+
+            # Restore search permission top-down to inspect the files
+            for dir_path in (root, os.path.join(root, "a"), os.path.join(root, "a", "b")):
+                assert stat.S_IMODE(os.stat(dir_path).st_mode) == 0o600
+                os.chmod(dir_path, 0o700)
+            low = os.path.join(root, "a", "b", "low.txt")
+            assert stat.S_IMODE(os.stat(low).st_mode) == 0o640
+
+    def test_set_permissions_recursive_skips_symlinks(self):
+        """Test symlinks inside the tree are not followed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = os.path.join(tmpdir, "root")
+            os.mkdir(root)
+            outside_file = os.path.join(tmpdir, "outside.txt")
+            outside_dir = os.path.join(tmpdir, "outside")
+            with open(outside_file, "w") as f:
+                f.write("content")
+            os.mkdir(outside_dir)
+            os.chmod(outside_file, 0o644)
+            os.chmod(outside_dir, 0o755)
+            os.symlink(outside_file, os.path.join(root, "file_link"))
+            os.symlink(outside_dir, os.path.join(root, "dir_link"))
+
+            set_permissions_recursive(root, 0o600, dir_mode=0o700)
+
+            assert stat.S_IMODE(os.stat(outside_file).st_mode) == 0o644
+            assert stat.S_IMODE(os.stat(outside_dir).st_mode) == 0o755
+
+    @contextmanager
+    def _after_first_listing(self, action):
+        """Run action once the first directory has been listed, before its entries are used."""
+        real_scandir = os.scandir
+        pending = [action]
+
+        def scandir(fd):
+            with real_scandir(fd) as it:
+                entries = list(it)
+            while pending:
+                pending.pop()()
+            return nullcontext(entries)
+
+        with patch("shadowfs.core.file_ops.os.scandir", side_effect=scandir):
+            yield
+
+    @pytest.mark.parametrize("o_path", [True, False])
+    def test_set_permissions_recursive_entry_swapped_for_symlink(self, o_path):
+        """Test entries replaced by symlinks after listing are skipped, not followed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = os.path.join(tmpdir, "root")
+            os.makedirs(os.path.join(root, "sub"))
+            with open(os.path.join(root, "file.txt"), "w") as f:
+                f.write("content")
+            outside_file = os.path.join(tmpdir, "outside.txt")
+            outside_dir = os.path.join(tmpdir, "outside")
+            with open(outside_file, "w") as f:
+                f.write("content")
+            os.mkdir(outside_dir)
+            os.chmod(outside_file, 0o644)
+            os.chmod(outside_dir, 0o755)
+
+            def swap():
+                os.unlink(os.path.join(root, "file.txt"))
+                os.symlink(outside_file, os.path.join(root, "file.txt"))
+                os.rmdir(os.path.join(root, "sub"))
+                os.symlink(outside_dir, os.path.join(root, "sub"))
+
+            with self._after_first_listing(swap), patch(
+                "shadowfs.core.file_ops._O_PATH", file_ops._O_PATH if o_path else 0
+            ):
+                set_permissions_recursive(root, 0o600, dir_mode=0o700)
+
+            assert stat.S_IMODE(os.stat(outside_file).st_mode) == 0o644
+            assert stat.S_IMODE(os.stat(outside_dir).st_mode) == 0o755
+            assert stat.S_IMODE(os.stat(root).st_mode) == 0o700
+
+    @pytest.mark.parametrize("o_path", [True, False])
+    def test_set_permissions_recursive_entry_removed(self, o_path):
+        """Test a file removed after listing is reported as not found."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._make_tree(tmpdir)
+
+            with self._after_first_listing(
+                lambda: os.unlink(os.path.join(tmpdir, "top.txt"))
+            ), patch("shadowfs.core.file_ops._O_PATH", file_ops._O_PATH if o_path else 0):
+                with pytest.raises(FileOperationError) as exc_info:
+                    set_permissions_recursive(tmpdir, 0o644)
+            assert exc_info.value.error_code == ErrorCode.NOT_FOUND
+
+    def test_set_permissions_recursive_dir_replaced_by_file(self):
+        """Test a directory replaced by a file after listing fails and closes descriptors."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._make_tree(tmpdir)
+
+            def replace():
+                shutil.rmtree(os.path.join(tmpdir, "a"))
+                with open(os.path.join(tmpdir, "a"), "w") as f:
+                    f.write("content")
+
+            before = open_fds()
+            with self._after_first_listing(replace):
+                with pytest.raises(FileOperationError) as exc_info:
+                    set_permissions_recursive(tmpdir, 0o644)
+            assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
+            assert open_fds() - before == set()
+
+    def test_set_permissions_recursive_deeper_than_recursion_limit(self):
+        """Test the walk does not recurse per directory level."""
+        depth = 300
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fd = os.open(tmpdir, os.O_RDONLY | os.O_DIRECTORY)
+            for _ in range(depth):
+                os.mkdir("d", dir_fd=fd)
+                next_fd = os.open("d", os.O_RDONLY | os.O_DIRECTORY, dir_fd=fd)
+                os.close(fd)
+                fd = next_fd
+            with open("leaf.txt", "w", opener=lambda name, flags: os.open(name, flags, dir_fd=fd)):
+                pass
+            os.close(fd)
+
+            limit = sys.getrecursionlimit()
+            sys.setrecursionlimit(depth // 2 + 100)
+            try:
+                set_permissions_recursive(tmpdir, 0o600, dir_mode=0o700)
+            finally:
+                sys.setrecursionlimit(limit)
+
+            leaf = os.path.join(tmpdir, *["d"] * depth, "leaf.txt")
+            assert stat.S_IMODE(os.stat(leaf).st_mode) == 0o600
+            assert stat.S_IMODE(os.stat(os.path.dirname(leaf)).st_mode) == 0o700
+
+    def test_set_permissions_recursive_single_file(self):
+        """Test a file path is changed like set_permissions."""
+        with tempfile.NamedTemporaryFile() as tmp:
+            set_permissions_recursive(tmp.name, 0o600, dir_mode=0o700)
+            assert stat.S_IMODE(os.stat(tmp.name).st_mode) == 0o600
+
+    def test_set_permissions_recursive_not_found(self):
+        """Test a missing root path."""
+        with pytest.raises(FileOperationError) as exc_info:
+            set_permissions_recursive("/nonexistent/dir", 0o644)
+        assert exc_info.value.error_code == ErrorCode.NOT_FOUND
+
+    def test_set_permissions_recursive_denied(self):
+        """Test permission errors inside the tree."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._make_tree(tmpdir)
+            with patch("os.chmod", side_effect=PermissionError("Permission denied")):
+                with pytest.raises(FileOperationError) as exc_info:
+                    set_permissions_recursive(tmpdir, 0o644)
+            assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
+
+    def test_set_permissions_recursive_io_error(self):
+        """Test other OS errors inside the tree."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._make_tree(tmpdir)
+            with patch("os.fchmod", side_effect=OSError("OS error")):
+                with pytest.raises(FileOperationError) as exc_info:
+                    set_permissions_recursive(tmpdir, 0o644)
+            assert exc_info.value.error_code == ErrorCode.INTERNAL_ERROR
+
+
 class TestCreateSymlink:
     """Test create_symlink function."""
 
@@ -1050,16 +1867,13 @@ class TestCreateSymlink:
     def test_create_symlink_permission_denied(self):
         """Test creating symlink with permission denied."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            os.chmod(tmpdir, 0o444)  # Read-only
             target = "/tmp/target"
             link = os.path.join(tmpdir, "link")
 
-            try:
+            with chmod_temporarily(tmpdir, 0o444):  # Read-only
                 with pytest.raises(FileOperationError) as exc_info:
                     create_symlink(target, link)
-                assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
-            finally:
-                os.chmod(tmpdir, 0o755)
+            assert exc_info.value.error_code == ErrorCode.PERMISSION_DENIED
 
     def test_create_symlink_io_error(self):
         """Test creating symlink with IO error."""
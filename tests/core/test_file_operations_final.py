@@ -4,7 +4,7 @@
 import errno
 import os
 import tempfile
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import mock_open
 
 import pytest
 
@@ -72,14 +72,13 @@ class TestFinalCoverage:
 
     def test_open_file_close_error_ignored(self):
         """Test open_file context manager ignores close errors."""
-        # Create a mock file that raises error on close
-        mock_file = MagicMock()
-        mock_file.close.side_effect = OSError("Close failed")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "test.txt")
 
-        with patch("builtins.open", return_value=mock_file):
-            # This should not raise even though close fails
-            with open_file("/fake/path", "r") as f:
-                pass  # File opened and used
+            # Closing the descriptor underneath the file object makes its
+            # flush and close fail with EBADF; this should not raise
+            with open_file(file_path, "w") as f:
+                f.write("pending")
+                os.close(f.fileno())
 
-            # Verify close was attempted
-            mock_file.close.assert_called_once()
+            assert f.closed
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Comprehensive tests for the Metrics module."""
 
+import _thread
 import threading
 import time
 from unittest.mock import MagicMock, patch
@@ -8,10 +9,18 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from shadowfs.core.metrics import (
+    LOCK_STRIPES,
+    SORTED_BINNING_MIN_BATCH,
     Metric,
     MetricsCollector,
     MetricType,
     MetricValue,
+    RWLock,
+    _bin_values,
+    _canonical_labels,
+    _format_value,
+    _prometheus_labels,
+    _quantiles,
     get_metrics,
     set_global_metrics,
 )
@@ -34,6 +43,33 @@ class TestMetricType:
         assert MetricType.HISTOGRAM != MetricType.SUMMARY
 
 
+class TestAggregationHelpers:
+    """Tests for histogram binning and quantile helpers."""
+
+    def test_bin_values_per_value(self):
+        """Test small batches bin each value with le semantics."""
+        counts = [0, 0, 0]
+        _bin_values(counts, [0.1, 1.0], [0.05, 0.1, 0.5, 5.0])
+        assert counts == [2, 1, 1]
+
+    def test_bin_values_sorted_batch(self):
+        """Test large batches bin like the per-value path."""
+        values = [0.05, 0.1, 0.5, 1.0, 5.0] * SORTED_BINNING_MIN_BATCH
+        counts = [0, 0, 0]
+        _bin_values(counts, [0.1, 1.0], values)
+        assert counts == [2 * SORTED_BINNING_MIN_BATCH] * 2 + [SORTED_BINNING_MIN_BATCH]
+
+    def test_quantiles(self):
+        """Test quantiles pick the value at int(len * q)."""
+        values = [float(i) for i in range(10)]
+        assert _quantiles(values, (0.5, 0.9, 0.99)) == [(0.5, 5.0), (0.9, 9.0), (0.99, 9.0)]
+
+    def test_quantiles_out_of_range(self):
+        """Test quantiles indexing past the end are omitted."""
+        assert _quantiles([1.0], (0.5, 1.0)) == [(0.5, 1.0)]
+        assert _quantiles([], (0.5,)) == []
+
+
 class TestMetricValue:
     """Tests for MetricValue dataclass."""
 
@@ -42,7 +78,7 @@ class TestMetricValue:
         value = MetricValue(value=42.0, labels={"env": "prod"})
         assert value.value == 42.0
         assert value.labels == {"env": "prod"}
-        assert isinstance(value.timestamp, float)
+        assert isinstance(value.timestamp, int)
 
     def test_metric_value_defaults(self):
         """Test metric value default values."""
@@ -51,15 +87,48 @@ class TestMetricValue:
         assert value.labels == {}
         assert value.timestamp > 0
 
+    def test_metric_value_labels_key(self):
+        """Test metric value serializes its labels once at construction."""
+        value = MetricValue(value=1.0, labels={"b": "2", "a": "1"})
+        assert value.labels_key == "a=1,b=2"
+        assert MetricValue(value=1.0).labels_key == ""
+
+        # A supplied key is kept rather than recomputed
+        assert MetricValue(value=1.0, labels={"a": "1"}, labels_key="a=1").labels_key == "a=1"
+
+    def test_metric_value_format_labels(self):
+        """Test metric value formats its Prometheus labels once."""
+        value = MetricValue(value=1.0, labels={"b": "2", "a": "1"})
+        assert value.label_string is None
+
+        assert value.format_labels() == '{a="1",b="2"}'
+        assert value.label_string == '{a="1",b="2"}'
+        assert MetricValue(value=1.0).format_labels() == ""
+
+        # Later calls reuse the stored string
+        value.label_string = "cached"
+        assert value.format_labels() == "cached"
+
+    def test_merged_counter_reuses_label_string(self):
+        """Test merged counter values carry the shard cell's label string."""
+        collector = MetricsCollector()
+        collector.increment_counter("operations_total", labels={"op": "read"})
+        metric = collector._metrics["operations_total"]
+
+        merged = metric.values[0]
+        cell = metric.thread_shard()["op=read"]
+        assert merged.label_string == '{op="read"}'
+        assert cell.label_string is merged.label_string
+
     def test_metric_value_timestamp(self):
         """Test metric value timestamp can be set manually."""
         # Test that we can provide timestamp
-        value = MetricValue(value=5.0, timestamp=1234567890.0)
-        assert value.timestamp == 1234567890.0
+        value = MetricValue(value=5.0, timestamp=1234567890)
+        assert value.timestamp == 1234567890
 
         # Test that default timestamp is created
         value2 = MetricValue(value=10.0)
-        assert isinstance(value2.timestamp, float)
+        assert isinstance(value2.timestamp, int)
         assert value2.timestamp > 0
 
 
@@ -77,6 +146,37 @@ class TestMetric:
         assert metric.values == []
         assert metric.buckets is None
 
+    def test_stripe_lock_is_stable(self):
+        """Test the same label set always maps to the same lock stripe."""
+        metric = Metric(name="test_metric", metric_type=MetricType.GAUGE, description="Test")
+        assert len(metric._stripes) == LOCK_STRIPES
+        assert all(isinstance(lock, type(threading.Lock())) for lock in metric._stripes)
+
+        lock = metric.stripe_lock("env=prod")
+        assert lock is metric.stripe_lock("env=prod")
+        assert lock in metric._stripes
+
+    def test_locked_holds_all_stripes(self):
+        """Test locked() excludes updates on every stripe until released."""
+        metric = Metric(name="test_metric", metric_type=MetricType.GAUGE, description="Test")
+
+        with metric.locked():
+            assert metric._lock.locked()
+            assert all(lock.locked() for lock in metric._stripes)
+
+        assert not metric._lock.locked()
+        assert not any(lock.locked() for lock in metric._stripes)
+
+    def test_slotted_instances(self):
+        """Test metric and value instances use slots rather than a dict."""
+        metric = Metric(name="test_metric", metric_type=MetricType.COUNTER, description="Test")
+        value = MetricValue(value=1.0)
+
+        assert not hasattr(metric, "__dict__")
+        assert not hasattr(value, "__dict__")
+        with pytest.raises(AttributeError):
+            value.extra = 1
+
     def test_histogram_default_buckets(self):
         """Test histogram metric gets default buckets."""
         metric = Metric(
@@ -95,6 +195,66 @@ class TestMetric:
         )
         assert metric.buckets == custom_buckets
 
+    def test_counter_values_keyed_by_labels(self):
+        """Test assigning counter values stores one value per label set."""
+        metric = Metric(name="test_metric", metric_type=MetricType.COUNTER, description="Test")
+        metric.values = [
+            MetricValue(value=1.0, labels={"env": "prod"}),
+            MetricValue(value=2.0, labels={"env": "dev"}),
+            MetricValue(value=3.0, labels={"env": "prod"}),
+        ]
+
+        assert len(metric.values) == 2
+        assert metric._by_labels["env=prod"].value == 3.0
+        assert metric._by_labels["env=dev"].value == 2.0
+
+    def test_clear(self):
+        """Test clearing metric values."""
+        metric = Metric(name="test_metric", metric_type=MetricType.GAUGE, description="Test")
+        metric.values = [MetricValue(value=1.0)]
+        metric.clear()
+        assert metric.values == []
+
+    def test_histogram_buckets_sorted(self):
+        """Test histogram buckets are kept in ascending order."""
+        metric = Metric(
+            name="test_histogram",
+            metric_type=MetricType.HISTOGRAM,
+            description="Test histogram",
+            buckets=[1.0, 0.1, 0.5],
+        )
+        assert metric.buckets == [0.1, 0.5, 1.0]
+
+    def test_histogram_observe_bins_incrementally(self):
+        """Test observations update per-label bucket counts as recorded."""
+        metric = Metric(
+            name="test_histogram",
+            metric_type=MetricType.HISTOGRAM,
+            description="Test histogram",
+            buckets=[0.1, 1.0],
+        )
+        for value in (0.05, 0.1, 0.5, 2.0):
+            metric.observe("", {}, (value,))
+
+        series = metric._histogram[""]
+        assert series.bucket_counts == [2, 1, 1]  # 0.1 is counted in le="0.1"
+        assert series.count == 4
+        assert series.sum == 2.65
+
+    def test_assign_values_retaining_raw_samples(self):
+        """Test assigned observations are kept as-is when retaining samples."""
+        metric = Metric(
+            name="test_summary",
+            metric_type=MetricType.SUMMARY,
+            description="Test summary",
+            retain_raw_samples=True,
+        )
+        value = MetricValue(value=1.0, timestamp=5)
+        metric.values = [value]
+
+        assert metric.values == [value]
+        assert metric._summary[""].count == 1
+
     def test_non_histogram_buckets(self):
         """Test non-histogram metrics don't get buckets."""
         for metric_type in [MetricType.COUNTER, MetricType.GAUGE, MetricType.SUMMARY]:
@@ -102,6 +262,35 @@ class TestMetric:
             assert metric.buckets is None
 
 
+class TestRWLock:
+    """Tests for the readers-writer lock."""
+
+    def test_readers_share_lock(self):
+        """Test multiple readers can hold the lock at once."""
+        lock = RWLock()
+        with lock.read_lock():
+            with lock.read_lock():
+                assert lock._readers == 2
+        assert lock._readers == 0
+
+    def test_writer_waits_for_readers(self):
+        """Test a writer blocks until active readers release the lock."""
+        lock = RWLock()
+        acquired = threading.Event()
+
+        def writer():
+            with lock.write_lock():
+                acquired.set()
+
+        with lock.read_lock():
+            t = threading.Thread(target=writer)
+            t.start()
+            assert not acquired.wait(0.05)
+
+        t.join()
+        assert acquired.is_set()
+
+
 class TestMetricsCollector:
     """Tests for MetricsCollector class."""
 
@@ -110,7 +299,7 @@ class TestMetricsCollector:
         collector = MetricsCollector()
         assert collector.namespace == "shadowfs"
         assert isinstance(collector._metrics, dict)
-        assert isinstance(collector._lock, type(threading.RLock()))
+        assert isinstance(collector._lock, RWLock)
 
     def test_collector_custom_namespace(self):
         """Test collector with custom namespace."""
@@ -133,6 +322,18 @@ class TestMetricsCollector:
         assert "open_files" in collector._metrics
         assert "virtual_layers" in collector._metrics
 
+    def test_default_metrics_not_shared(self):
+        """Test each collector gets its own copies of the default metrics."""
+        first = MetricsCollector()
+        second = MetricsCollector(namespace="other")
+
+        hist1 = first._metrics["operation_duration_seconds"]
+        hist2 = second._metrics["operation_duration_seconds"]
+        assert hist1 is not hist2
+        assert hist1.buckets == [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+        assert hist1.buckets is not hist2.buckets
+        assert hist2._full_name == "other_operation_duration_seconds"
+
     def test_register_counter(self):
         """Test registering a counter metric."""
         collector = MetricsCollector()
@@ -143,6 +344,39 @@ class TestMetricsCollector:
         assert metric.metric_type == MetricType.COUNTER
         assert metric.description == "Test counter metric"
 
+    def test_register_prebuilds_export_strings(self):
+        """Test registration prebuilds the Prometheus name and header lines."""
+        collector = MetricsCollector(namespace="custom")
+        collector.register_gauge("test_gauge", "Test gauge metric")
+
+        metric = collector._metrics["test_gauge"]
+        assert metric._full_name == "custom_test_gauge"
+        assert metric._prelude == (
+            "# HELP custom_test_gauge Test gauge metric\n# TYPE custom_test_gauge gauge"
+        )
+
+    def test_register_rechecks_under_lock(self):
+        """Test a name registered while waiting for the lock is not replaced."""
+
+        class RacyDict(dict):
+            """Misses the first membership check, as if another thread won the race."""
+
+            missed = False
+
+            def __contains__(self, key):
+                if not self.missed:
+                    self.missed = True
+                    return False
+                return super().__contains__(key)
+
+        collector = MetricsCollector()
+        existing = collector._metrics["operations_total"]
+        collector._metrics = RacyDict(collector._metrics)
+
+        collector.register_counter("operations_total", "Replacement")
+
+        assert collector._metrics["operations_total"] is existing
+
     def test_register_counter_duplicate(self):
         """Test registering duplicate counter is ignored."""
         collector = MetricsCollector()
@@ -192,6 +426,15 @@ class TestMetricsCollector:
         assert metric.metric_type == MetricType.SUMMARY
         assert metric.description == "Test summary metric"
 
+    def test_register_summary_duplicate(self):
+        """Test registering duplicate summary is ignored."""
+        collector = MetricsCollector()
+        collector.register_summary("test_summary", "First description")
+        collector.register_summary("test_summary", "Second description")
+
+        metric = collector._metrics["test_summary"]
+        assert metric.description == "First description"
+
     def test_increment_counter(self):
         """Test incrementing a counter."""
         collector = MetricsCollector()
@@ -288,6 +531,22 @@ class TestMetricsCollector:
         assert len(metric.values) == 1
         assert metric.values[0].value == 20.0
 
+    def test_high_cardinality_labels(self):
+        """Test updates to many label sets each land on their own value."""
+        collector = MetricsCollector()
+        for _ in range(2):
+            for i in range(1000):
+                collector.increment_counter("operations_total", labels={"path": f"/f{i}"})
+                collector.set_gauge("open_files", float(i), labels={"path": f"/f{i}"})
+
+        counter = collector._metrics["operations_total"]
+        assert len(counter.thread_shard()) == 1000
+        assert all(value.value == 2.0 for value in counter.values)
+
+        gauge = collector._metrics["open_files"]
+        assert len(gauge._by_labels) == 1000
+        assert gauge._by_labels["path=/f999"].value == 999.0
+
     def test_set_gauge_nonexistent(self):
         """Test setting non-existent gauge is ignored."""
         collector = MetricsCollector()
@@ -302,21 +561,95 @@ class TestMetricsCollector:
         metric = collector._metrics["test_counter"]
         assert len(metric.values) == 0
 
+    def test_wrong_type_skips_lock(self):
+        """Test misrouted updates return before taking the metric lock."""
+        collector = MetricsCollector()
+        collector.register_counter("test_counter", "Test")
+        metric = collector._metrics["test_counter"]
+        stripe = MagicMock()
+        metric._stripes = (stripe,) * LOCK_STRIPES
+
+        collector.set_gauge("test_counter", 10.0)
+        collector.record_duration("test_counter", 0.1)
+        collector.record_durations("test_counter", [0.1])
+
+        stripe.__enter__.assert_not_called()
+
     def test_record_duration_histogram(self):
         """Test recording duration for histogram."""
         collector = MetricsCollector()
         collector.register_histogram("test_histogram", "Test")
 
+        collector.record_duration("test_histogram", 0.123)
+        metric = collector._metrics["test_histogram"]
+        assert metric.values == []  # Raw samples not retained by default
+        series = metric._histogram[""]
+        assert series.count == 1
+        assert series.sum == 0.123
+
+    def test_record_duration_histogram_retain_raw_samples(self):
+        """Test histogram keeps raw samples when asked to."""
+        collector = MetricsCollector()
+        collector.register_histogram("test_histogram", "Test", retain_raw_samples=True)
+
         collector.record_duration("test_histogram", 0.123)
         metric = collector._metrics["test_histogram"]
         assert len(metric.values) == 1
         assert metric.values[0].value == 0.123
+        assert metric._histogram[""].count == 1
 
     def test_record_duration_summary(self):
         """Test recording duration for summary."""
         collector = MetricsCollector()
         collector.register_summary("test_summary", "Test")
 
+        collector.record_duration("test_summary", 0.456)
+        metric = collector._metrics["test_summary"]
+        assert metric.values == []  # Raw samples not retained by default
+        series = metric._summary[""]
+        assert series.count == 1
+        assert series.reservoir.typecode == "d"
+        assert series.reservoir.tolist() == [0.456]
+
+    def test_record_duration_summary_reservoir_bounded(self):
+        """Test summary samples at most reservoir_size values per label set."""
+        collector = MetricsCollector()
+        collector.register_summary("test_summary", "Test", reservoir_size=10)
+
+        for i in range(100):
+            collector.record_duration("test_summary", float(i))
+
+        series = collector._metrics["test_summary"]._summary[""]
+        assert len(series.reservoir) == 10
+        assert set(series.reservoir) <= set(float(i) for i in range(100))
+        assert series.count == 100
+        assert series.sum == sum(range(100))
+
+    def test_summary_sorted_reservoir_cached(self):
+        """Test exports reuse the sorted reservoir until the next observation."""
+        collector = MetricsCollector()
+        collector.register_summary("test_summary", "Test")
+        collector.record_durations("test_summary", [0.3, 0.1, 0.2])
+        metric = collector._metrics["test_summary"]
+        series = metric._summary[""]
+
+        collector._aggregate(metric)
+        snapshot = series.sorted_reservoir
+        assert snapshot == [0.1, 0.2, 0.3]
+        collector._aggregate(metric)
+        assert series.sorted_reservoir is snapshot
+
+        collector.record_duration("test_summary", 0.0)
+        assert series.sorted_reservoir is None
+        labels, points, count, sum_value = collector._aggregate(metric)[""]
+        assert points[0] == (0.5, 0.2)
+        assert series.sorted_reservoir == [0.0, 0.1, 0.2, 0.3]
+
+    def test_record_duration_summary_retain_raw_samples(self):
+        """Test summary keeps raw samples when asked to."""
+        collector = MetricsCollector()
+        collector.register_summary("test_summary", "Test", retain_raw_samples=True)
+
         collector.record_duration("test_summary", 0.456)
         metric = collector._metrics["test_summary"]
         assert len(metric.values) == 1
@@ -329,7 +662,7 @@ class TestMetricsCollector:
 
         collector.record_duration("test_histogram", 0.1, labels={"op": "read"})
         metric = collector._metrics["test_histogram"]
-        assert metric.values[0].labels == {"op": "read"}
+        assert metric._histogram["op=read"].labels == {"op": "read"}
 
     def test_record_duration_nonexistent(self):
         """Test recording duration for non-existent metric is ignored."""
@@ -345,6 +678,82 @@ class TestMetricsCollector:
         metric = collector._metrics["test_counter"]
         assert len(metric.values) == 0
 
+    def test_record_durations_histogram(self):
+        """Test batch recording matches recording durations one by one."""
+        collector = MetricsCollector()
+        collector.register_histogram("batch", "Test", buckets=[0.1, 1.0])
+        collector.register_histogram("single", "Test", buckets=[0.1, 1.0])
+        durations = [(i % 20) / 10.0 for i in range(10000)]
+
+        collector.record_durations("batch", durations, labels={"op": "read"})
+        for duration in durations:
+            collector.record_duration("single", duration, labels={"op": "read"})
+
+        batch = collector._aggregate_histogram(collector._metrics["batch"])
+        single = collector._aggregate_histogram(collector._metrics["single"])
+        assert batch == single
+        assert batch[0][2] == 10000
+
+    def test_record_durations_sorted_binning_boundaries(self):
+        """Test large batches bin values on bucket limits like single records."""
+        collector = MetricsCollector()
+        collector.register_histogram("batch", "Test", buckets=[0.1, 0.5, 1.0])
+        collector.register_histogram("single", "Test", buckets=[0.1, 0.5, 1.0])
+        durations = [0.0, 0.1, 0.1, 0.3, 0.5, 1.0, 2.0] * 10
+        assert len(durations) >= SORTED_BINNING_MIN_BATCH
+
+        collector.record_durations("batch", durations)
+        for duration in durations:
+            collector.record_duration("single", duration)
+
+        batch = collector._metrics["batch"]._histogram[""]
+        assert batch.bucket_counts == [30, 20, 10, 10]
+        assert batch == collector._metrics["single"]._histogram[""]
+
+    def test_aggregate_keyed_by_labels(self):
+        """Test the shared aggregate snapshot for histograms and summaries."""
+        collector = MetricsCollector()
+        collector.register_histogram("test_histogram", "Test", buckets=[0.1, 1.0])
+        collector.register_summary("test_summary", "Test")
+        collector.record_durations("test_histogram", [0.05, 0.5], labels={"op": "read"})
+        collector.record_durations("test_summary", [0.5, 1.5], labels={"op": "read"})
+
+        histogram = collector._aggregate(collector._metrics["test_histogram"])
+        labels, points, count, sum_value = histogram["op=read"]
+        assert labels == {"op": "read"}
+        assert points == [(0.1, 1), (1.0, 2), (float("inf"), 2)]
+        assert (count, sum_value) == (2, 0.55)
+
+        summary = collector._aggregate(collector._metrics["test_summary"])
+        labels, points, count, sum_value = summary["op=read"]
+        assert points == [(0.5, 1.5), (0.9, 1.5), (0.99, 1.5)]
+        assert (count, sum_value) == (2, 2.0)
+
+    def test_record_durations_summary(self):
+        """Test batch recording for summaries."""
+        collector = MetricsCollector()
+        collector.register_summary("test_summary", "Test", retain_raw_samples=True)
+
+        collector.record_durations("test_summary", iter([0.1, 0.2, 0.3]))
+
+        metric = collector._metrics["test_summary"]
+        assert [v.value for v in metric.values] == [0.1, 0.2, 0.3]
+        assert len({v.timestamp for v in metric.values}) == 1
+        assert metric._summary[""].count == 3
+
+    def test_record_durations_nonexistent(self):
+        """Test batch recording for non-existent metric is ignored."""
+        collector = MetricsCollector()
+        collector.record_durations("nonexistent", [0.1])  # Should not raise
+
+    def test_record_durations_wrong_type(self):
+        """Test batch recording for wrong metric type is ignored."""
+        collector = MetricsCollector()
+        collector.register_counter("test_counter", "Test")
+        collector.record_durations("test_counter", [0.1])  # Should not raise
+
+        assert collector._metrics["test_counter"].values == []
+
     def test_get_metric(self):
         """Test getting a metric by name."""
         collector = MetricsCollector()
@@ -394,6 +803,23 @@ class TestMetricsCollector:
         result = collector._serialize_labels({"b": "2", "a": "1", "c": "3"})
         assert result == "a=1,b=2,c=3"
 
+    def test_serialize_labels_cached(self):
+        """Test serializing a repeated label set hits the cache."""
+        collector = MetricsCollector()
+        collector._serialize_labels({"b": "2", "a": "1"})
+        hits = _canonical_labels.cache_info().hits
+        assert collector._serialize_labels({"a": "1", "b": "2"}) == "a=1,b=2"
+        assert _canonical_labels.cache_info().hits == hits + 1
+
+    def test_serialize_single_label_skips_cache(self):
+        """Test a single label is serialized directly without the cache."""
+        collector = MetricsCollector()
+        misses = _canonical_labels.cache_info().misses
+        hits = _canonical_labels.cache_info().hits
+        assert collector._serialize_labels({"op": "read"}) == "op=read"
+        assert _canonical_labels.cache_info().misses == misses
+        assert _canonical_labels.cache_info().hits == hits
+
     def test_format_labels_empty(self):
         """Test formatting empty labels for Prometheus."""
         collector = MetricsCollector()
@@ -412,6 +838,29 @@ class TestMetricsCollector:
         result = collector._format_labels({"env": "prod", "host": "server1"})
         assert result == '{env="prod",host="server1"}'
 
+    def test_label_template_splits_around_extra(self):
+        """Test label template places the extra label in sorted position."""
+        collector = MetricsCollector()
+        head, tail = collector._label_template({"z": "2", "a": "1", "le": "old"}, "le")
+        assert head == '{a="1",'
+        assert tail == ',z="2"}'
+        assert head + 'le="0.5"' + tail == collector._format_labels(
+            {"a": "1", "le": "0.5", "z": "2"}
+        )
+
+    def test_format_labels_cached(self):
+        """Test formatting a repeated label set hits the cache."""
+        collector = MetricsCollector()
+        collector._format_labels({"env": "prod", "host": "server1"})
+        hits = _prometheus_labels.cache_info().hits
+        collector._format_labels({"host": "server1", "env": "prod"})
+        assert _prometheus_labels.cache_info().hits == hits + 1
+
+    def test_label_template_empty(self):
+        """Test label template with no labels."""
+        collector = MetricsCollector()
+        assert collector._label_template({}, "quantile") == ("{", "}")
+
 
 class TestPrometheusExport:
     """Tests for Prometheus export functionality."""
@@ -474,6 +923,16 @@ class TestPrometheusExport:
         assert 'shadowfs_latency_count{op="read"} 4' in output
         assert 'shadowfs_latency_sum{op="read"} 2.55' in output
 
+    def test_export_histogram_multiple_labels(self):
+        """Test histogram bucket labels stay sorted around the le label."""
+        collector = MetricsCollector()
+        collector.register_histogram("latency", "Request latency", buckets=[0.1])
+        collector.record_duration("latency", 0.05, labels={"op": "read", "app": "x"})
+
+        output = collector.export_prometheus()
+        assert 'shadowfs_latency_bucket{app="x",le="0.1",op="read"} 1' in output
+        assert 'shadowfs_latency_bucket{app="x",le="inf",op="read"} 1' in output
+
     def test_export_summary(self):
         """Test exporting summary metrics."""
         collector = MetricsCollector()
@@ -548,6 +1007,131 @@ class TestPrometheusExport:
         assert count == 1
         assert total_sum == 1.0
 
+    def test_export_render_cache_disabled_by_default(self):
+        """Test exports are re-rendered when no TTL is configured."""
+        collector = MetricsCollector()
+        collector.increment_counter("operations_total")
+
+        assert collector.export_prometheus() is not collector.export_prometheus()
+        assert collector._render_cache is None
+
+    def test_export_render_cache_reused_within_ttl(self):
+        """Test an unchanged collector returns the cached export."""
+        collector = MetricsCollector(render_ttl=60.0)
+        collector.increment_counter("operations_total")
+
+        output = collector.export_prometheus()
+        assert collector.export_prometheus() is output
+
+    def test_export_render_cache_invalidated_by_update(self):
+        """Test updates through the collector invalidate the cached export."""
+        collector = MetricsCollector(render_ttl=60.0)
+        output = collector.export_prometheus()
+
+        collector.increment_counter("operations_total")
+        updated = collector.export_prometheus()
+        assert updated is not output
+        assert "shadowfs_operations_total 1\n" in updated
+
+        collector.set_gauge("open_files", 3.0)
+        assert "shadowfs_open_files 3\n" in collector.export_prometheus()
+
+        collector.record_duration("operation_duration_seconds", 0.1)
+        assert "shadowfs_operation_duration_seconds_count 1" in collector.export_prometheus()
+
+        collector.register_counter("new_counter", "New")
+        assert "# HELP shadowfs_new_counter New" in collector.export_prometheus()
+
+        collector.clear_metrics()
+        assert "shadowfs_operations_total 1\n" not in collector.export_prometheus()
+
+    def test_format_value(self):
+        """Test integral values drop the trailing .0 and others keep full precision."""
+        assert _format_value(2.0) == "2"
+        assert _format_value(-3.0) == "-3"
+        assert _format_value(7) == "7"
+        assert _format_value(2.55) == "2.55"
+        assert _format_value(0.1 + 0.2) == "0.30000000000000004"
+        assert _format_value(1e300) == "1e+300"
+        assert _format_value(float("inf")) == "inf"
+
+    def test_export_integral_values(self):
+        """Test exported samples are written without a trailing .0."""
+        collector = MetricsCollector()
+        collector.increment_counter("operations_total", value=3.0)
+        collector.record_duration("operation_duration_seconds", 2.0)
+
+        output = collector.export_prometheus()
+        assert "shadowfs_operations_total 3\n" in output
+        assert "shadowfs_operation_duration_seconds_sum 2\n" in output
+        assert 'shadowfs_operation_duration_seconds_bucket{le="5.0"} 1\n' in output
+
+    def test_export_reuses_unchanged_metric_sections(self):
+        """Test each metric's rendered section is reused until it is updated."""
+        collector = MetricsCollector()
+        collector.increment_counter("operations_total")
+        collector.record_duration("operation_duration_seconds", 0.1)
+        collector.export_prometheus()
+
+        counter = collector._metrics["operations_total"]
+        histogram = collector._metrics["operation_duration_seconds"]
+        counter_section = counter._rendered
+        histogram_section = histogram._rendered
+
+        collector.increment_counter("operations_total")
+        output = collector.export_prometheus()
+
+        assert "shadowfs_operations_total 2\n" in output
+        assert counter._rendered is not counter_section
+        assert histogram._rendered is histogram_section
+
+    def test_export_section_invalidated_by_direct_updates(self):
+        """Test updating a metric object directly invalidates its section."""
+        collector = MetricsCollector()
+        collector.export_prometheus()
+        gauge = collector._metrics["open_files"]
+        histogram = collector._metrics["operation_duration_seconds"]
+
+        gauge.values = [MetricValue(value=7.0)]
+        histogram.observe("", {}, (0.1,))
+        output = collector.export_prometheus()
+        assert "shadowfs_open_files 7\n" in output
+        assert "shadowfs_operation_duration_seconds_count 1" in output
+
+        gauge.clear()
+        assert "shadowfs_open_files 7\n" not in collector.export_prometheus()
+
+    def test_export_prometheus_bytes(self):
+        """Test the bytes export matches the UTF-8 encoded text export."""
+        collector = MetricsCollector()
+        collector.set_gauge("open_files", 2.0, labels={"path": "caf\u00e9"})
+
+        output = collector.export_prometheus_bytes()
+        assert isinstance(output, bytes)
+        assert output == collector.export_prometheus().encode("utf-8")
+
+    def test_export_prometheus_bytes_cached(self):
+        """Test the encoded export is reused along with the cached text."""
+        collector = MetricsCollector(render_ttl=60.0)
+        collector.increment_counter("operations_total")
+
+        output = collector.export_prometheus_bytes()
+        assert collector.export_prometheus_bytes() is output
+
+        collector.increment_counter("operations_total")
+        updated = collector.export_prometheus_bytes()
+        assert updated is not output
+        assert b"shadowfs_operations_total 2\n" in updated
+
+    def test_export_render_cache_expires(self):
+        """Test the cached export is re-rendered once the TTL elapses."""
+        collector = MetricsCollector(render_ttl=60.0)
+
+        with patch("shadowfs.core.metrics.time.monotonic", return_value=100.0):
+            output = collector.export_prometheus()
+        with patch("shadowfs.core.metrics.time.monotonic", return_value=200.0):
+            assert collector.export_prometheus() is not output
+
 
 class TestThreadSafety:
     """Tests for thread safety of metrics collector."""
@@ -573,6 +1157,130 @@ class TestThreadSafety:
         metric = collector._metrics["test_counter"]
         assert metric.values[0].value == 1000
 
+    def test_counter_shards_per_thread(self):
+        """Test counter increments are sharded per thread and merged on read."""
+        collector = MetricsCollector()
+        collector.register_counter("test_counter", "Test")
+        collector.increment_counter("test_counter", labels={"env": "prod"}, value=2.0)
+
+        t = threading.Thread(
+            target=collector.increment_counter,
+            args=("test_counter", {"env": "prod"}, 3.0),
+        )
+        t.start()
+        t.join()
+
+        metric = collector._metrics["test_counter"]
+        assert len(metric._shards) == 2
+        assert len(metric.values) == 1
+        assert metric.values[0].value == 5.0
+        assert metric.values[0].labels == {"env": "prod"}
+
+    def test_export_folds_dead_thread_shards(self):
+        """Test shards of exited threads are folded into the base values."""
+        collector = MetricsCollector()
+        collector.increment_counter("operations_total", labels={"op": "read"})
+
+        threads = [
+            threading.Thread(
+                target=collector.increment_counter,
+                args=("operations_total", {"op": op}, 2.0),
+            )
+            for op in ("read", "write")
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        metric = collector._metrics["operations_total"]
+        assert len(metric._shards) == 3
+
+        output = collector.export_prometheus()
+        assert 'shadowfs_operations_total{op="read"} 3\n' in output
+        assert 'shadowfs_operations_total{op="write"} 2\n' in output
+        assert [owner() for owner, _ in metric._shards] == [metric._local.owner]
+        assert set(metric._by_labels) == {"op=read", "op=write"}
+        assert {v.labels_key: v.value for v in metric.values} == {"op=read": 3.0, "op=write": 2.0}
+
+    def test_fold_shards_of_non_python_threads(self):
+        """Test shards of threads started outside threading are folded."""
+        collector = MetricsCollector()
+        metric = collector._metrics["operations_total"]
+        workers = 50
+        finished = threading.Semaphore(0)
+
+        def worker():
+            collector.increment_counter("operations_total")
+            finished.release()
+
+        for _ in range(workers):
+            _thread.start_new_thread(worker, ())
+        for _ in range(workers):
+            assert finished.acquire(timeout=5)
+        assert len(metric._shards) == workers
+
+        # Thread state, and with it the shard owner, is freed just after the
+        # worker function returns
+        deadline = time.monotonic() + 5
+        while metric._shards and time.monotonic() < deadline:
+            with metric.locked():
+                metric.fold_dead_shards()
+            time.sleep(0.01)
+
+        assert metric._shards == []
+        assert metric.values[0].value == workers
+
+    def test_counter_shards_merge_with_assigned_values(self):
+        """Test assigned counter values are merged with thread shards."""
+        metric = Metric(name="test_counter", metric_type=MetricType.COUNTER, description="Test")
+        metric.values = [MetricValue(value=1.0, labels={"env": "prod"}, timestamp=1)]
+        metric.thread_shard()["env=prod"] = MetricValue(
+            value=2.0, labels={"env": "prod"}, timestamp=2
+        )
+
+        assert len(metric.values) == 1
+        assert metric.values[0].value == 3.0
+        assert metric.values[0].timestamp == 2
+
+    def test_set_gauge_lock_free_update(self):
+        """Test existing gauge label sets are updated without the lock."""
+        collector = MetricsCollector()
+        collector.set_gauge("open_files", 1.0, labels={"fs": "a"})
+        metric = collector._metrics["open_files"]
+        stripe = MagicMock()
+        metric._stripes = (stripe,) * LOCK_STRIPES
+
+        collector.set_gauge("open_files", 2.0, labels={"fs": "a"})
+
+        stripe.__enter__.assert_not_called()
+        assert metric.values[0].value == 2.0
+
+    def test_set_gauge_creation_race(self):
+        """Test a label set created by another thread is updated, not replaced."""
+
+        class RacyDict(dict):
+            """Misses the first lookup, as if another thread inserted meanwhile."""
+
+            missed = False
+
+            def get(self, key, default=None):
+                if not self.missed:
+                    self.missed = True
+                    return default
+                return super().get(key, default)
+
+        collector = MetricsCollector()
+        collector.set_gauge("open_files", 1.0)
+        metric = collector._metrics["open_files"]
+        existing = metric._by_labels[""]
+        metric._by_labels = RacyDict(metric._by_labels)
+
+        collector.set_gauge("open_files", 5.0)
+
+        assert metric._by_labels[""] is existing
+        assert existing.value == 5.0
+
     def test_concurrent_different_labels(self):
         """Test concurrent operations with different labels."""
         collector = MetricsCollector()
@@ -75,9 +75,10 @@ class TestMissingCoverage:
 
         collector._metrics["test"] = metric
 
-        # This should handle the case where split produces parts without "="
+        # Labels are read from the series rather than parsed from the key
         result = collector._aggregate_summary(metric)
-        assert len(result) >= 0  # Should not crash
+        assert len(result) == 1
+        assert result[0][0] == {}
 
     def test_quantile_index_boundary(self):
         """Test quantile calculation at boundary conditions."""
@@ -132,9 +133,14 @@ class TestMissingCoverage:
 
         metric.values = test_values
 
-        # Test aggregation handles all cases
+        # Test aggregation keeps each stored label set intact
         result = collector._aggregate_histogram(metric)
-        assert len(result) > 0
+        counts = {tuple(sorted(labels.items())): count for labels, _, count, _ in result}
+        assert counts == {
+            (): 1,
+            (("another", "test"), ("key", "value")): 2,
+            (("bad", "format"),): 2,
+        }
 
     def test_context_manager_cleanup(self):
         """Test that context managers are properly cleaned up in all metrics operations."""
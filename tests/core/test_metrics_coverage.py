@@ -109,7 +109,7 @@ class TestBranchCoverage:
             assert val == 1.0
 
     def test_aggregate_histogram_label_without_equals(self):
-        """Test branch at line 424 when label_key has part without '='."""
+        """Test histogram labels come from the stored dict, not the serialized key."""
         collector = MetricsCollector()
         metric = Metric(
             name="test", metric_type=MetricType.HISTOGRAM, description="Test", buckets=[0.1, 1.0]
@@ -141,11 +141,12 @@ class TestBranchCoverage:
         # Restore original
         collector._serialize_labels = original_serialize
 
-        # Should still process without crashing
-        assert len(result) >= 0
+        # Labels are read from the series, so a corrupted key is never parsed
+        assert len(result) == 1
+        assert result[0][0] == {"key": "value"}
 
     def test_aggregate_summary_label_without_equals(self):
-        """Test branch at line 469 when label_key has part without '='."""
+        """Test summary labels come from the stored dict, not the serialized key."""
         collector = MetricsCollector()
         metric = Metric(name="test", metric_type=MetricType.SUMMARY, description="Test")
 
@@ -170,8 +171,9 @@ class TestBranchCoverage:
         # Restore
         collector._serialize_labels = original_serialize
 
-        # Should process without crashing
-        assert len(result) >= 0
+        # Labels are read from the series, so a malformed key is never parsed
+        assert len(result) == 1
+        assert result[0][0] == {"key": "value"}
 
     def test_prometheus_export_branch_344_to_367(self):
         """Test branch in export_prometheus for histogram path."""
@@ -128,8 +128,9 @@ class TestFinalBranchCoverage:
 
         # Test with very large number of values to ensure quantiles work
         collector.register_summary("large_summary", "Large dataset")
-        for i in range(1000):
-            collector.record_duration("large_summary", float(i) / 100.0, labels={"size": "large"})
+        collector.record_durations(
+            "large_summary", [float(i) / 100.0 for i in range(1000)], labels={"size": "large"}
+        )
 
         # Export should handle large datasets
         output = collector.export_prometheus()
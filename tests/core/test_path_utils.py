@@ -81,11 +81,26 @@ class TestNormalizePath:
 
     def test_invalid_path(self):
         """Invalid path should raise error."""
-        with patch("pathlib.Path.resolve", side_effect=OSError("Invalid")):
+        with patch("os.path.realpath", side_effect=OSError("Invalid")):
             with pytest.raises(PathError) as exc_info:
                 normalize_path("/invalid\0path")
             assert "Invalid path" in str(exc_info.value)
 
+    def test_null_byte_path(self):
+        """Embedded null bytes should raise PathError."""
+        with pytest.raises(PathError) as exc_info:
+            normalize_path("/invalid\0path")
+        assert "Invalid path" in str(exc_info.value)
+
+    def test_symlink_loop(self):
+        """Symlink loops are left for the caller's file operation to report."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            loop = os.path.join(tmpdir, "loop")
+            os.symlink(loop, loop)
+
+            result = normalize_path(loop)
+            assert os.path.islink(result)
+
 
 class TestIsSafePath:
     """Test safe path checking."""
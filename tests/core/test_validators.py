@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 """Unit tests for shadowfs.core.validators module."""
 
+import copy
+import pickle
 import re
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from shadowfs.core import validators
 from shadowfs.core.validators import (
     ValidationError,
     validate_cache_config,
@@ -43,6 +46,62 @@ class TestValidationError:
         assert error.error_code == ErrorCode.INVALID_INPUT
         assert str(error) == "Invalid value"
 
+    def test_validation_error_pickle_keeps_error_code(self):
+        """Test pickling and copying preserve a non-default error code."""
+        from shadowfs.core.constants import ErrorCode
+
+        error = ValidationError("Missing", ErrorCode.NOT_FOUND)
+        for restored in (pickle.loads(pickle.dumps(error)), copy.copy(error)):
+            assert restored.error_code == ErrorCode.NOT_FOUND
+            assert str(restored) == "Missing"
+
+    def test_validation_error_lower_message(self):
+        """Test lower_message renders the template once, lower-cased."""
+        error = ValidationError("Path Traversal in {path}", path="/A/../B")
+        assert error.lower_message == "path traversal in /a/../b"
+        assert error.lower_message is error.lower_message
+
+    def test_validation_error_pickle_keeps_details(self):
+        """Test pickling and copying preserve template details."""
+        with pytest.raises(ValidationError) as exc_info:
+            validate_config({"version": "1.0", "sources": "not-a-list"})
+        error = exc_info.value
+        assert error.details
+
+        for restored in (pickle.loads(pickle.dumps(error)), copy.copy(error)):
+            assert restored.details == error.details
+            assert str(restored) == str(error) == "Sources must be a list"
+
+    def test_validation_error_code(self):
+        """Test code mirrors error_code for default and explicit codes."""
+        from shadowfs.core.constants import ErrorCode
+
+        with pytest.raises(ValidationError) as exc_info:
+            validate_path("/data/../etc/passwd")
+        assert exc_info.value.code is ErrorCode.INVALID_INPUT
+        error = ValidationError("Denied", error_code=ErrorCode.PERMISSION_DENIED)
+        assert error.code is ErrorCode.PERMISSION_DENIED
+
+    def test_validation_error_template_details(self):
+        """Test message templates are formatted from details when rendered."""
+        error = ValidationError("Port must be in range 1-65535, got {port}", port=70000)
+        assert error.details == {"port": 70000}
+        assert error.args == ("Port must be in range 1-65535, got {port}",)
+        assert str(error) == "Port must be in range 1-65535, got 70000"
+
+    def test_validation_error_without_details_keeps_braces(self):
+        """Test a plain message containing braces is not treated as a template."""
+        assert str(ValidationError("Must be one of {'a'}")) == "Must be one of {'a'}"
+
+    def test_nested_validation_error_message(self):
+        """Test wrapped section errors render the underlying message."""
+        with pytest.raises(ValidationError) as exc_info:
+            validate_config({"version": "1.0", "sources": [{"path": "/data", "priority": -1}]})
+        assert str(exc_info.value) == (
+            "Invalid source configuration at index 0: "
+            "Source priority must be non-negative integer: -1"
+        )
+
 
 class TestValidateConfig:
     """Tests for validate_config function."""
@@ -119,6 +178,69 @@ class TestValidateConfig:
         with pytest.raises(ValidationError):
             validate_config(config)
 
+    def test_sections_set_to_none_are_rejected(self):
+        """Test a section explicitly set to None is validated, not treated as absent."""
+        for section in ("sources", "rules", "transforms", "virtual_layers", "cache"):
+            with pytest.raises(ValidationError):
+                validate_config({"version": "1.0", section: None})
+        with pytest.raises(ValidationError) as exc_info:
+            validate_config({"version": None})
+        assert "string" in str(exc_info.value).lower()
+
+    def test_repeated_config_served_from_cache(self):
+        """Test an unchanged configuration is only validated once."""
+        validators._validate_config_cache.clear()
+        config = {"version": "1.0", "sources": [{"path": "/data"}]}
+        assert validate_config(config) == True
+
+        with patch.object(validators, "_validate_config") as mock_validate:
+            assert validate_config({"version": "1.0", "sources": [{"path": "/data"}]}) == True
+            mock_validate.assert_not_called()
+
+            config["sources"].append({"path": "/other"})
+            validate_config(config)
+            mock_validate.assert_called_once_with(config)
+
+    def test_failed_config_not_cached(self):
+        """Test configurations that fail validation are not remembered."""
+        validators._validate_config_cache.clear()
+        config = {"version": "1.0", "sources": "not-a-list"}
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                validate_config(config)
+        assert validators._validate_config_cache == {}
+
+    def test_config_cache_evicts_oldest(self, monkeypatch):
+        """Test the cache keeps only the most recent configurations."""
+        validators._validate_config_cache.clear()
+        monkeypatch.setattr(validators, "CONFIG_CACHE_SIZE", 2)
+        for version in ("1.0", "1.1", "1.2"):
+            validate_config({"version": version})
+        assert len(validators._validate_config_cache) == 2
+
+        with patch.object(validators, "_validate_config", return_value=True) as mock_validate:
+            validate_config({"version": "1.2"})
+            mock_validate.assert_not_called()
+            validate_config({"version": "1.0"})
+            mock_validate.assert_called_once()
+
+    def test_config_cache_distinguishes_types(self):
+        """Test equal-looking configurations of different types are not conflated."""
+        validators._validate_config_cache.clear()
+        assert validate_config({"version": "1.0", "cache": {"enabled": True}}) == True
+        assert validate_config({"version": "1.0", "sources": [{"path": "/data"}]}) == True
+        with pytest.raises(ValidationError):
+            validate_config({"version": "1.0", "cache": {"enabled": 1}})
+        with pytest.raises(ValidationError):
+            validate_config({"version": "1.0", "sources": ({"path": "/data"},)})
+
+    def test_unpicklable_config_validated_uncached(self):
+        """Test configurations that cannot be pickled are still validated."""
+        validators._validate_config_cache.clear()
+        config = {"version": "1.0", "hook": lambda: None}
+        assert validate_config(config) == True
+        assert validators._validate_config_cache == {}
+
 
 class TestValidateSourceConfig:
     """Tests for validate_source_config function."""
@@ -214,6 +336,15 @@ class TestValidateRuleConfig:
             validate_rule_config(rule)
         assert "priority" in str(exc_info.value).lower()
 
+    def test_rule_type_enum_member_and_unhashable(self):
+        """Test rule types accept enum members and reject unhashable values."""
+        from shadowfs.core.constants import RuleType
+
+        assert validate_rule_config({"type": RuleType.EXCLUDE, "pattern": "*.tmp"}) == True
+        with pytest.raises(ValidationError) as exc_info:
+            validate_rule_config({"type": ["exclude"], "pattern": "*.tmp"})
+        assert "invalid rule type" in str(exc_info.value).lower()
+
 
 class TestValidateTransformConfig:
     """Tests for validate_transform_config function."""
@@ -349,6 +480,14 @@ class TestValidateCacheConfig:
             validate_cache_config(cache)
         assert "ttl" in str(exc_info.value).lower()
 
+    def test_invalid_eviction_policy_lists_choices(self):
+        """Test the eviction policy error lists the choices in a stable order."""
+        with pytest.raises(ValidationError) as exc_info:
+            validate_cache_config({"eviction_policy": "random"})
+        assert str(exc_info.value) == (
+            "Invalid eviction policy: random. Must be one of ['fifo', 'lfu', 'lru']"
+        )
+
 
 class TestValidatePath:
     """Tests for validate_path function."""
@@ -377,12 +516,30 @@ class TestValidatePath:
             validate_path("/data/../../../etc/passwd")
         assert "traversal" in str(exc_info.value).lower()
 
+    def test_traversal_is_a_whole_segment(self):
+        """Test only '..' segments count as traversal, not '..' inside names."""
+        for path in ("..", "../data", "data/..", "/data/../etc", "./../data"):
+            with pytest.raises(ValidationError) as exc_info:
+                validate_path(path)
+            assert "traversal" in str(exc_info.value).lower()
+        for path in ("/data/file..txt", "/data/...", "/data/..hidden", "/data/v1..2/"):
+            assert validate_path(path) == True
+
     def test_invalid_null_bytes(self):
         """Test path with null bytes."""
         with pytest.raises(ValidationError) as exc_info:
             validate_path("/data/file\x00.txt")
         assert "null" in str(exc_info.value).lower()
 
+    def test_control_characters(self):
+        """Test control characters are rejected but tab, newline and CR are allowed."""
+        for char in ("\x01", "\x08", "\x0b", "\x0c", "\x0e", "\x1f"):
+            with pytest.raises(ValidationError) as exc_info:
+                validate_path(f"/data/file{char}.txt")
+            assert "control" in str(exc_info.value).lower()
+        for char in ("\t", "\n", "\r"):
+            assert validate_path(f"/data/file{char}.txt") == True
+
 
 class TestValidatePattern:
     """Tests for validate_pattern function."""
@@ -436,6 +593,11 @@ class TestValidateLayerName:
             validate_layer_name("layer name")
         assert "invalid" in str(exc_info.value).lower()
 
+    def test_invalid_trailing_newline(self):
+        """Test layer name with a trailing newline."""
+        with pytest.raises(ValidationError):
+            validate_layer_name("by-type\n")
+
 
 class TestValidateVersion:
     """Tests for validate_version function."""
@@ -464,6 +626,17 @@ class TestValidateVersion:
             validate_version("one.zero")
         assert "format" in str(exc_info.value).lower()
 
+    def test_invalid_trailing_newline(self):
+        """Test version with a trailing newline."""
+        with pytest.raises(ValidationError):
+            validate_version("1.0\n")
+
+    def test_invalid_non_ascii_digits(self):
+        """Test version numbers must use ASCII digits."""
+        with pytest.raises(ValidationError) as exc_info:
+            validate_version("\u0661.\u0660")
+        assert "format" in str(exc_info.value).lower()
+
 
 class TestValidatePort:
     """Tests for validate_port function."""
@@ -498,6 +671,14 @@ class TestValidatePort:
             validate_port("http")
         assert "numeric" in str(exc_info.value).lower()
 
+    def test_string_port_must_be_plain_digits(self):
+        """Test string ports are digits only, with no sign, spaces or separators."""
+        assert validate_port("0443") == True
+        for port in (" 80", "80 ", "+80", "-80", "8_080", "8.0", "\u00b2"):
+            with pytest.raises(ValidationError) as exc_info:
+                validate_port(port)
+            assert "numeric" in str(exc_info.value).lower()
+
 
 class TestValidateFileSize:
     """Tests for validate_file_size function."""
@@ -559,6 +740,24 @@ class TestValidatePermissions:
             validate_permissions("rwxr-xr-x")
         assert "octal" in str(exc_info.value).lower()
 
+    def test_invalid_permission_types(self):
+        """Test bools, floats and other non-int types are rejected."""
+        import stat
+
+        assert validate_permissions(stat.S_IRWXU) == True
+        for mode in (True, False, 420.0, b"644", None):
+            with pytest.raises(ValidationError) as exc_info:
+                validate_permissions(mode)
+            assert "octal" in str(exc_info.value).lower()
+
+    def test_invalid_loosely_formatted_string_permissions(self):
+        """Test strings int() would accept but are not plain octal digits."""
+        assert validate_permissions("0O644") == True
+        for mode in (" 644", "644\n", "6_44", "+644", "0o"):
+            with pytest.raises(ValidationError) as exc_info:
+                validate_permissions(mode)
+            assert "octal" in str(exc_info.value).lower()
+
 
 class TestValidateRegex:
     """Tests for validate_regex function."""
@@ -588,6 +787,19 @@ class TestValidateRegex:
             validate_regex(r"[unclosed")
         assert "compile" in str(exc_info.value).lower()
 
+    def test_compiled_patterns_are_cached(self):
+        """Test repeated patterns reuse one compiled object and failures are not cached."""
+        validators._compile_cached.cache_clear()
+        first = validate_regex(r"^cached-\d+$")
+        assert validate_regex(r"^cached-\d+$") is first
+        assert validate_pattern(r"regex:^cached-\d+$") == True
+        assert validators._compile_cached.cache_info().hits == 2
+
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                validate_regex(r"[unclosed")
+        assert validators._compile_cached.cache_info().currsize == 1
+
 
 class TestValidateGlob:
     """Tests for validate_glob function."""
@@ -614,6 +826,23 @@ class TestValidateGlob:
             validate_glob("*.txt\x00")
         assert "invalid" in str(exc_info.value).lower()
 
+    def test_double_star_must_fill_segment(self):
+        """Test '**' in absolute patterns must be a whole path segment."""
+        assert validate_glob("/src/**/test/**") == True
+        assert validate_glob("/**") == True
+        assert validate_glob("src/a**b") == True
+        for pattern, part in (("/src/a**/x", "a**"), ("/src/**b", "**b"), ("/***", "***")):
+            with pytest.raises(ValidationError) as exc_info:
+                validate_glob(pattern)
+            assert str(exc_info.value) == f"'**' must be alone in path segment: {part}"
+
+    def test_non_printable_without_control_chars(self):
+        """Test non-printable characters that are not control characters are allowed."""
+        assert validate_glob("*.txt\t") == True
+        assert validate_glob("file\u200b*.txt") == True
+        assert validate_pattern("file\u200b*.txt") == True
+        assert validate_path("/data/file\u200b.txt") == True
+
 
 class TestValidateTimeout:
     """Tests for validate_timeout function."""
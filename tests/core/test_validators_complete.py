@@ -474,10 +474,10 @@ class TestValidateRegexComplete:
     """Complete tests for validate_regex."""
 
     def test_regex_not_string(self):
-        """Test regex that's not a string - raises TypeError."""
-        # validate_regex doesn't check type, so re.compile() raises TypeError
-        with pytest.raises((ValidationError, TypeError)):
+        """Test regex that's not a string."""
+        with pytest.raises(ValidationError) as exc_info:
             validate_regex(123)
+        assert "string" in str(exc_info.value).lower()
 
     def test_regex_compile_error(self):
         """Test regex that doesn't compile."""
@@ -497,10 +497,10 @@ class TestValidateGlobComplete:
     """Complete tests for validate_glob."""
 
     def test_glob_not_string(self):
-        """Test glob that's not a string - raises TypeError."""
-        # validate_glob doesn't check type first, so len() raises TypeError
-        with pytest.raises((ValidationError, TypeError)):
+        """Test glob that's not a string."""
+        with pytest.raises(ValidationError) as exc_info:
             validate_glob(123)
+        assert "string" in str(exc_info.value).lower()
 
     def test_glob_with_null(self):
         """Test glob with null byte."""
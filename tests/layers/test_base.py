@@ -94,6 +94,31 @@ class TestFileInfo:
         assert info.path == os.path.join("src", "project.py")
         assert info.real_path == str(test_file.absolute())
 
+    def test_from_path_source_root_trailing_separator(self, temp_dir):
+        """Test from_path() strips the root prefix when source_root ends with a separator."""
+        src_dir = temp_dir / "src"
+        src_dir.mkdir()
+        test_file = src_dir / "project.py"
+        test_file.write_text("# code")
+
+        info = FileInfo.from_path(str(test_file), source_root=str(temp_dir) + os.sep)
+
+        assert info.path == os.path.join("src", "project.py")
+
+    def test_from_path_outside_source_root(self, temp_dir):
+        """Test from_path() falls back to relpath() for files outside source_root."""
+        root = temp_dir / "root"
+        root.mkdir()
+        # Sibling whose name shares the root's prefix must not be treated as inside it
+        other = temp_dir / "rootless"
+        other.mkdir()
+        test_file = other / "file.txt"
+        test_file.write_text("content")
+
+        info = FileInfo.from_path(str(test_file), source_root=str(root))
+
+        assert info.path == os.path.join("..", "rootless", "file.txt")
+
     def test_from_path_without_source_root(self, temp_dir):
         """Test from_path() uses filename as path when no source_root."""
         test_file = temp_dir / "test.txt"
@@ -518,8 +543,11 @@ class TestFileInfoEdgeCases:
 
         monkeypatch.setattr(os.path, "relpath", mock_relpath)
 
-        # Should fall back to using real_path as path
-        info = FileInfo.from_path(str(test_file), str(temp_dir))
+        # Should fall back to using real_path as path (root must not contain the
+        # file, otherwise the prefix shortcut never reaches relpath)
+        other_root = temp_dir / "other"
+        other_root.mkdir()
+        info = FileInfo.from_path(str(test_file), str(other_root))
         assert info.path == str(test_file)
         assert info.name == "test.txt"
 